@@ -3,14 +3,22 @@ Abstract Syntax Tree (AST) Node Definitions
 """
 
 class ASTNode:
-    pass
+    # Nodes keep their fields in __slots__ (no per-node __dict__),
+    # listed in the order __init__ assigns them
+    __slots__ = ()
+    # Slots that only cache semantic-analysis results; left out of AST dumps
+    _cache_fields = ()
 
 class Program(ASTNode):
+    __slots__ = ('functions', 'statements')
+    
     def __init__(self, functions, statements):
         self.functions = functions  # List of FunctionDecl
         self.statements = statements  # Main program statements
 
 class DeclStmt(ASTNode):
+    __slots__ = ('var_type', 'identifier', 'init_value', 'line')
+    
     def __init__(self, var_type, identifier, init_value=None, line=0):
         self.var_type = var_type
         self.identifier = identifier
@@ -18,12 +26,16 @@ class DeclStmt(ASTNode):
         self.line = line
 
 class AssignStmt(ASTNode):
+    __slots__ = ('identifier', 'expression', 'line')
+    
     def __init__(self, identifier, expression, line=0):
         self.identifier = identifier
         self.expression = expression
         self.line = line
 
 class IfStmt(ASTNode):
+    __slots__ = ('condition', 'if_block', 'elif_parts', 'else_block', 'line')
+    
     def __init__(self, condition, if_block, elif_parts, else_block, line=0):
         self.condition = condition
         self.if_block = if_block
@@ -32,6 +44,10 @@ class IfStmt(ASTNode):
         self.line = line
 
 class LoopStmt(ASTNode):
+    __slots__ = ('var_name', 'start_expr', 'end_expr', 'step_expr', 'block', 'line', 'use_existing_var',
+                 'resolved_entry')
+    _cache_fields = ('resolved_entry',)
+    
     def __init__(self, var_name, start_expr, end_expr, step_expr, block, line=0, use_existing_var=False):
         self.var_name = var_name
         self.start_expr = start_expr  # Can be None if using existing variable
@@ -40,29 +56,40 @@ class LoopStmt(ASTNode):
         self.block = block
         self.line = line
         self.use_existing_var = use_existing_var  # True if variable already declared
+        self.resolved_entry = None  # Loop variable's SymbolEntry, set during semantic analysis
 
 class ConditionalLoopStmt(ASTNode):
+    __slots__ = ('condition', 'block', 'line')
+    
     def __init__(self, condition, block, line=0):
         self.condition = condition
         self.block = block
         self.line = line
 
 class PrintStmt(ASTNode):
+    __slots__ = ('expressions', 'line')
+    
     def __init__(self, expressions, line=0):
         self.expressions = expressions  # List of expressions
         self.line = line
 
 class InputStmt(ASTNode):
+    __slots__ = ('identifier', 'line')
+    
     def __init__(self, identifier, line=0):
         self.identifier = identifier
         self.line = line
 
 class ReturnStmt(ASTNode):
+    __slots__ = ('expression', 'line')
+    
     def __init__(self, expression=None, line=0):
         self.expression = expression
         self.line = line
 
 class FunctionDecl(ASTNode):
+    __slots__ = ('return_type', 'name', 'parameters', 'body', 'line')
+    
     def __init__(self, return_type, name, parameters, body, line=0):
         self.return_type = return_type
         self.name = name
@@ -71,17 +98,25 @@ class FunctionDecl(ASTNode):
         self.line = line
 
 class FunctionCall(ASTNode):
+    __slots__ = ('name', 'arguments', 'line', 'return_type', 'resolved_entry')
+    _cache_fields = ('resolved_entry',)
+    
     def __init__(self, name, arguments, line=0):
         self.name = name
         self.arguments = arguments  # List of expressions
         self.line = line
         self.return_type = None  # Set during semantic analysis
+        self.resolved_entry = None  # Function's SymbolEntry, set during semantic analysis
 
 class Block(ASTNode):
+    __slots__ = ('statements',)
+    
     def __init__(self, statements):
         self.statements = statements
 
 class BinaryOp(ASTNode):
+    __slots__ = ('left', 'operator', 'right', 'line', 'result_type')
+    
     def __init__(self, left, operator, right, line=0):
         self.left = left
         self.operator = operator
@@ -90,6 +125,8 @@ class BinaryOp(ASTNode):
         self.result_type = None  # Set during semantic analysis
 
 class UnaryOp(ASTNode):
+    __slots__ = ('operator', 'operand', 'line', 'result_type')
+    
     def __init__(self, operator, operand, line=0):
         self.operator = operator
         self.operand = operand
@@ -97,12 +134,18 @@ class UnaryOp(ASTNode):
         self.result_type = None
 
 class Identifier(ASTNode):
+    __slots__ = ('name', 'line', 'var_type', 'resolved_entry')
+    _cache_fields = ('resolved_entry',)
+    
     def __init__(self, name, line=0):
         self.name = name
         self.line = line
         self.var_type = None  # Set during semantic analysis
+        self.resolved_entry = None  # SymbolEntry the name refers to, set during semantic analysis
 
 class Literal(ASTNode):
+    __slots__ = ('value', 'lit_type', 'line')
+    
     def __init__(self, value, lit_type, line=0):
         self.value = value
         self.lit_type = lit_type  # 'int', 'float', 'char'
@@ -235,23 +235,25 @@ class Compiler:
         node_type = node.__class__.__name__
         result += f"{prefix}{node_type}\n"
         
-        if hasattr(node, '__dict__'):
-            for key, value in node.__dict__.items():
-                if key.startswith('_'):
-                    continue
-                if isinstance(value, list):
-                    if value:
-                        result += f"{prefix}  {key}:\n"
-                        for item in value:
-                            if hasattr(item, '__class__') and hasattr(item.__class__, '__name__'):
-                                result += self._ast_to_string(item, indent + 2)
-                            else:
-                                result += f"{prefix}    {item}\n"
-                elif hasattr(value, '__class__') and hasattr(value.__class__, '__name__') and value.__class__.__module__ == 'ast_nodes':
+        # AST node fields, in __init__ order (see ast_nodes.ASTNode)
+        cache_fields = getattr(node, '_cache_fields', ())
+        for key in getattr(node, '__slots__', ()):
+            if key in cache_fields:
+                continue
+            value = getattr(node, key)
+            if isinstance(value, list):
+                if value:
                     result += f"{prefix}  {key}:\n"
-                    result += self._ast_to_string(value, indent + 2)
-                else:
-                    result += f"{prefix}  {key}: {value}\n"
+                    for item in value:
+                        if hasattr(item, '__class__') and hasattr(item.__class__, '__name__'):
+                            result += self._ast_to_string(item, indent + 2)
+                        else:
+                            result += f"{prefix}    {item}\n"
+            elif hasattr(value, '__class__') and hasattr(value.__class__, '__name__') and value.__class__.__module__ == 'ast_nodes':
+                result += f"{prefix}  {key}:\n"
+                result += self._ast_to_string(value, indent + 2)
+            else:
+                result += f"{prefix}  {key}: {value}\n"
         
         return result
     
@@ -261,7 +263,7 @@ class Compiler:
         content += "PHASE 3 OUTPUT: SYMBOL TABLE\n"
         content += "=" * 70 + "\n\n"
         
-        for level, scope in enumerate(symbol_table.scopes):
+        for level, scope in enumerate(symbol_table.active_scopes()):
             content += f"\nScope Level {level}:\n"
             content += f"{'Name':<15} {'Type':<15} {'Line':<8} {'Init':<8} {'Offset':<8}\n"
             content += "-" * 70 + "\n"
@@ -288,7 +290,7 @@ class Compiler:
         content += f"  - AST Built: ✓\n\n"
         
         content += "PHASE 3: Semantic Analysis\n"
-        content += f"  - Variables in Symbol Table: {sum(len(scope) for scope in symbol_table.scopes)}\n\n"
+        content += f"  - Variables in Symbol Table: {sum(len(scope) for scope in symbol_table.active_scopes())}\n\n"
         
         content += "PHASE 4: Intermediate Code Generation\n"
         content += f"  - TAC Instructions: {len(tac_code)}\n\n"
@@ -3,24 +3,209 @@ TAC INTERPRETER
 Executes Three-Address Code and shows output
 """
 
+import operator
+import re
+import sys
+
+# Human-readable line written for every PRINT instruction
+OUTPUT_LINE = "  Output: {}\n".format
+
+# Opcodes of assembled TAC instructions
+OP_NOP = 0  # Labels, blank lines, END_FUNC markers
+OP_ASSIGN = 1
+OP_RETVAL = 2
+OP_IF_FALSE = 3
+OP_GOTO = 4
+OP_PRINT = 5
+OP_PUSH = 6
+OP_CALL = 7
+OP_PARAM = 8
+OP_RETURN = 9
+OP_ENTER_SCOPE = 10
+OP_EXIT_SCOPE = 11
+OP_ALLOC = 12
+OP_READ = 13
+OP_END_MAIN = 14
+# Superinstructions built by fuse_superinstructions (no TAC keyword)
+OP_ASSIGN_IF_FALSE = 15  # t = expr; IF_FALSE t GOTO label
+OP_ASSIGN_COPY = 16      # t = expr; var = t
+# Loop header replaced by its compiled version (see jit_compile)
+OP_JIT_LOOP = 17
+NUM_OPCODES = 18
+
+TAC_OPCODES = {
+    'IF_FALSE': OP_IF_FALSE,
+    'GOTO': OP_GOTO,
+    'PRINT': OP_PRINT,
+    'PUSH': OP_PUSH,
+    'CALL': OP_CALL,
+    'PARAM': OP_PARAM,
+    'RETURN': OP_RETURN,
+    'ENTER_SCOPE': OP_ENTER_SCOPE,
+    'EXIT_SCOPE': OP_EXIT_SCOPE,
+    'ALLOC': OP_ALLOC,
+    'READ': OP_READ,
+    'END_MAIN': OP_END_MAIN,
+}
+
+# Operands of a TAC expression (a quoted char literal may be a space)
+TAC_OPERAND = re.compile(r"'.'|\S+")
+
+# Tags of pre-classified TAC operands (see classify_token)
+TAG_LIT = 0  # (TAG_LIT, value) for number and char literals
+TAG_VAR = 1  # (TAG_VAR, slot)
+
+# Slot of the RETVAL register in every frame
+RETVAL_SLOT = 0
+
+# Kinds of parsed TAC expressions (see parse_expression)
+EXPR_VALUE = 0  # (EXPR_VALUE, operand)
+EXPR_BINOP = 1  # (EXPR_BINOP, op_code, left_operand, right_operand)
+EXPR_NEG = 2    # (EXPR_NEG, operand)
+EXPR_NOT = 3    # (EXPR_NOT, operand)
+
+# TAC binary operators; an operator's op_code is its index here
+BINARY_OPERATORS = ('+', '-', '*', '/', '%', '<', '>', '<=', '>=', '==', '!=', '&&', '||')
+BINOP_CODES = {op: code for code, op in enumerate(BINARY_OPERATORS)}
+
+
+def _divide(left, right):
+    return left / right if right != 0 else 0
+
+
+def _modulo(left, right):
+    return left % right if right != 0 else 0
+
+
+def _and(left, right):
+    return 1 if (left and right) else 0
+
+
+def _or(left, right):
+    return 1 if (left or right) else 0
+
+
+def expression_operands(expr):
+    """Operands of an expression produced by parse_expression"""
+    if expr[0] == EXPR_BINOP:
+        return expr[2:]
+    return expr[1:]
+
+
+# Implementation of each binary operator, indexed by op_code. Comparisons
+# are the C-level operator functions and yield bools; write_output prints
+# them as 1/0
+BINOP_TABLE = (operator.add, operator.sub, operator.mul, _divide, _modulo,
+               operator.lt, operator.gt, operator.le, operator.ge, operator.eq, operator.ne,
+               _and, _or)
+
+# Python source counting a backward jump or call in compiled TAC
+# (compile_to_python); mirrors TACInterpreter.count_iteration
+COUNT_ITERATION = ["_n += 1",
+                   "if _n > _limit:",
+                   "    raise _Stop"]
+
+# Python source templates for TAC binary operators (compile_to_python)
+PY_BINARY_OPS = {
+    '+': '{0} + {1}',
+    '-': '{0} - {1}',
+    '*': '{0} * {1}',
+    '/': '({0} / {1} if {1} != 0 else 0)',
+    '%': '({0} % {1} if {1} != 0 else 0)',
+    '<': '(1 if {0} < {1} else 0)',
+    '>': '(1 if {0} > {1} else 0)',
+    '<=': '(1 if {0} <= {1} else 0)',
+    '>=': '(1 if {0} >= {1} else 0)',
+    '==': '(1 if {0} == {1} else 0)',
+    '!=': '(1 if {0} != {1} else 0)',
+    '&&': '(1 if ({0} and {1}) else 0)',
+    '||': '(1 if ({0} or {1}) else 0)',
+}
+
+
+def as_int(value):
+    """Assignment conversion for int variables: single char -> ASCII code"""
+    if isinstance(value, str) and len(value) == 1:
+        return ord(value)
+    return value
+
+
+def as_float(value):
+    """Assignment conversion for float variables: int -> float"""
+    if isinstance(value, int):
+        return float(value)
+    return value
+
+
+def convert_value(var_type, value):
+    """Convert a value assigned to a variable declared with var_type"""
+    if var_type == 'int':
+        return as_int(value)
+    if var_type == 'float':
+        return as_float(value)
+    return value
+
+
+class IterationLimit(Exception):
+    """Raised by compiled TAC once it uses up max_iterations"""
+
+
+def drive(routine):
+    """
+    Run a compiled routine (a generator, see compile_to_python) on an
+    explicit frame stack: each CALL yields (callee, args) and is resumed
+    with the callee's return value, so recursion depth is not limited by
+    Python's stack
+    """
+    stack = [routine]
+    value = None
+    while stack:
+        try:
+            callee, args = stack[-1].send(value)
+        except StopIteration as done:
+            stack.pop()
+            value = done.value
+        else:
+            stack.append(callee(*args))
+            value = None
+
+
 class TACInterpreter:
-    def __init__(self):
-        self.variables = {}
-        self.var_types = {}  # Track variable types for conversions
+    def __init__(self, quiet=False):
+        # Every variable name gets a slot index at assemble time; a frame
+        # is a list of values indexed by slot (None = not defined)
+        self.slots = {'RETVAL': RETVAL_SLOT}  # name -> slot
+        self.slot_names = ['RETVAL']  # slot -> name
+        self.global_vars = []  # Frame of MAIN, visible to every function
+        self.local_stack = [self.global_vars]  # One frame per active call
+        self.variables = self.global_vars  # Current frame (local_stack[-1])
+        self.var_types = []  # Declared type per slot, for conversions
         self.labels = {}
         self.functions = {}
         self.arg_stack = []  # For function arguments
+        self.call_args = []  # Arguments of the latest CALL, in parameter order
         self.call_stack = []  # For function call frames
         self.scope_stack = []  # For block scope management
         self.pc = 0  # Program counter
         self.instructions = []
+        # Decoded program as parallel arrays indexed by PC: the opcode and
+        # the operands (jump targets already resolved to PCs)
+        self.ops = []
+        self.args = []
         self.output = []
-        self.max_iterations = 100000  # Prevent infinite loops (increased for recursion)
+        self.quiet = quiet  # Skip the "Output:" lines entirely (benchmarking)
+        self.output_buffer = []  # Pending "Output:" lines, written in chunks
+        self.output_buffer_size = 0
+        self.flush_threshold = 4096  # Characters buffered before writing to stdout
+        self.max_iterations = 100000  # Loop iterations and calls before stopping (infinite loop guard)
         self.iteration_count = 0
+        self.jit_threshold = 50  # Back-edges before a loop is compiled (None = never)
+        self.back_edge_counts = {}  # Loop header PC -> times jumped back to
+        self.jit_cache = {}  # Loop header PC -> compiled loop
     
     def execute(self, tac_code):
         """Execute TAC instructions"""
-        self.instructions = tac_code
+        self.instructions = [instruction.strip() for instruction in tac_code]
         
         # First pass: find labels and functions
         for i, instruction in enumerate(self.instructions):
@@ -31,337 +216,968 @@ class TACInterpreter:
                     func_name = label[5:]  # Remove 'FUNC_' prefix
                     self.functions[func_name] = i
         
-        # Second pass: execute from MAIN
+        # Second pass: decode every instruction once
+        decoded = [self.assemble(instruction) for instruction in self.instructions]
+        self.ops = [op for op, _ in decoded]
+        self.args = [operands for _, operands in decoded]
+        self.fuse_superinstructions()
+        
+        # Frames and type table are sized once every name has a slot
+        self.global_vars = [None] * len(self.slot_names)
+        self.local_stack = [self.global_vars]
+        self.variables = self.global_vars
+        self.var_types = [None] * len(self.slot_names)
+        
+        # Third pass: execute from MAIN
         if 'MAIN' in self.labels:
             self.pc = self.labels['MAIN'] + 1
             self.run()
+            self.flush()
         else:
             print("Error: No MAIN label found")
         
         return self.output
     
-    def run(self):
-        """Run instructions from current PC"""
-        while self.pc < len(self.instructions):
-            self.iteration_count += 1
-            
-            # Safety check for infinite loops
-            if self.iteration_count > self.max_iterations:
-                print(f"\nWarning: Stopped after {self.max_iterations} iterations (possible infinite loop)")
-                break
-            
-            instruction = self.instructions[self.pc].strip()
-            
-            # Skip empty lines and labels
-            if not instruction or instruction.endswith(':'):
-                self.pc += 1
+    def assemble(self, instruction):
+        """
+        Decode a TAC instruction into (opcode, operands).
+        Jump and call labels are resolved to the PC after the label
+        (None if the label does not exist).
+        """
+        parts = instruction.split()
+        
+        # Skip empty lines and labels
+        if not parts or instruction.endswith(':'):
+            return (OP_NOP, ())
+        
+        # Assignment: var = value or var = expr
+        if len(parts) > 1 and parts[1] == '=':
+            var_name = parts[0]
+            expr = instruction.split('=', 1)[1].strip()
+        elif parts[0] in TAC_OPCODES or parts[0].startswith('END_FUNC'):
+            var_name = None
+        elif '=' in instruction:
+            # Check if it's an assignment (has = but not ==, !=, <=, >=)
+            # Split on first = and check if left side is a single identifier
+            var_name, expr = (part.strip() for part in instruction.split('=', 1))
+            if not var_name or any(c in var_name for c in ['<', '>', '!', ' ']):
+                return (OP_NOP, ())
+        else:
+            return (OP_NOP, ())
+        
+        if var_name is not None:
+            # Special case for RETVAL
+            if expr == 'RETVAL':
+                return (OP_RETVAL, (self.slot(var_name),))
+            return (OP_ASSIGN, (self.slot(var_name), self.parse_expression(expr)))
+        
+        op = TAC_OPCODES.get(parts[0], OP_NOP)
+        if op == OP_ALLOC:
+            return (op, (self.slot(parts[1]), parts[2] if len(parts) > 2 else 'int'))
+        if op == OP_GOTO:
+            return (op, (self.label_target(parts[1]),))
+        if op == OP_IF_FALSE:
+            return (op, (self.classify_token(parts[1]), self.label_target(parts[3])))
+        if op == OP_PRINT or op == OP_PUSH:
+            return (op, (self.classify_token(parts[1]),))
+        if op == OP_CALL:
+            return (op, (self.label_target(parts[1]), int(parts[2])))
+        if op == OP_RETURN:
+            return (op, (self.classify_token(parts[1]) if len(parts) > 1 else None,))
+        if op == OP_PARAM:
+            return (op, (self.slot(parts[1]), int(parts[2]) if len(parts) > 2 else 0))
+        if op == OP_READ:
+            return (op, (self.slot(parts[1]),))
+        return (op, tuple(parts[1:]))
+    
+    def slot(self, var_name):
+        """Slot index of a variable name, assigning the next free one"""
+        if var_name not in self.slots:
+            self.slots[var_name] = len(self.slot_names)
+            self.slot_names.append(var_name)
+        return self.slots[var_name]
+    
+    def fuse_superinstructions(self):
+        """
+        Peephole pass over the decoded program: fuse a temporary's
+        assignment with the IF_FALSE or copy that consumes it, so the pair
+        costs one dispatch. The fused instruction skips its second half,
+        which stays in place (nothing can jump to it: a jump target always
+        follows a label line).
+        """
+        ops = self.ops
+        args = self.args
+        for i in range(len(ops) - 1):
+            if ops[i] != OP_ASSIGN:
                 continue
+            temp, expr = args[i]
+            next_op, next_operands = ops[i + 1], args[i + 1]
             
-            # End of main
-            if instruction == 'END_MAIN':
-                break
+            # t = a < b; IF_FALSE t GOTO label
+            if next_op == OP_IF_FALSE and next_operands[0] == (TAG_VAR, temp):
+                ops[i] = OP_ASSIGN_IF_FALSE
+                args[i] = (temp, expr, next_operands[1])
             
-            # Execute instruction
-            try:
-                self.execute_instruction(instruction)
-            except Exception as e:
-                print(f"Error executing: {instruction}")
-                print(f"Error: {e}")
-                raise
-            self.pc += 1
+            # t = a + b; var = t
+            elif (next_op == OP_ASSIGN and next_operands[0] != temp
+                  and next_operands[1] == (EXPR_VALUE, (TAG_VAR, temp))):
+                ops[i] = OP_ASSIGN_COPY
+                args[i] = (temp, expr, next_operands[0])
+    
+    def label_target(self, label):
+        """PC of the first instruction after a label"""
+        if label in self.labels:
+            return self.labels[label] + 1
+        return None
     
-    def execute_instruction(self, instruction):
-        """Execute a single TAC instruction"""
-        
-        # ENTER_SCOPE - save current variable state
-        if instruction.startswith('ENTER_SCOPE'):
-            # Save both the variable names AND their values
-            # Also track which variables are allocated in this scope
-            self.scope_stack.append({
-                'var_names': set(self.variables.keys()),
-                'var_values': dict(self.variables),
-                'allocated_in_scope': set()  # Track variables ALLOCated in this scope
-            })
-        
-        # EXIT_SCOPE - restore variables from before scope
-        elif instruction.startswith('EXIT_SCOPE'):
-            if self.scope_stack:
-                scope_info = self.scope_stack.pop()
-                old_var_names = scope_info['var_names']
-                old_var_values = scope_info['var_values']
-                allocated_in_scope = scope_info['allocated_in_scope']
+    def run(self):
+        """Run instructions from current PC"""
+        # Loop state lives in locals; self.pc is only written before a
+        # handler runs (handlers jump by assigning it) and read back after
+        ops = self.ops
+        args = self.args
+        end = len(ops)
+        handlers = self.HANDLERS
+        pc = self.pc
+        # The infinite-loop guard is not checked here: only backward GOTOs
+        # and CALLs can make a program run forever, so those handlers
+        # count iterations (see count_iteration)
+        try:
+            while pc < end:
+                op = ops[pc]
+                operands = args[pc]
+                pc += 1
                 
-                # Remove or restore variables based on whether they were allocated in this scope
-                current_var_names = list(self.variables.keys())
-                for var_name in current_var_names:
-                    if var_name not in old_var_names:
-                        # Variable was declared ONLY in this scope, remove it
-                        del self.variables[var_name]
-                    elif var_name in allocated_in_scope:
-                        # Variable was re-declared (shadowed) in this scope, restore old value
-                        self.variables[var_name] = old_var_values[var_name]
-                    # else: variable existed before and was just modified, keep new value
-        
-        # ALLOC variable type
-        elif instruction.startswith('ALLOC'):
-            parts = instruction.split()
-            var_name = parts[1]
-            var_type = parts[2] if len(parts) > 2 else 'int'
-            
-            # Track variable type
-            self.var_types[var_name] = var_type
-            
-            # Track if this is an allocation in a scope
-            if self.scope_stack:
-                self.scope_stack[-1]['allocated_in_scope'].add(var_name)
-            
-            self.variables[var_name] = 0  # Initialize to 0
-        
-        # PRINT variable
-        elif instruction.startswith('PRINT'):
-            parts = instruction.split()
-            var_name = parts[1]
-            value = self.get_value(var_name)
-            print(f"  Output: {value}")
-            self.output.append(value)
-        
-        # READ variable
-        elif instruction.startswith('READ'):
-            parts = instruction.split()
-            var_name = parts[1]
-            value = input(f"Input {var_name}: ")
-            try:
-                self.variables[var_name] = int(value)
-            except:
+                # Skip empty lines, labels and END_FUNC markers
+                if op == OP_NOP:
+                    continue
+                
+                # End of main
+                if op == OP_END_MAIN:
+                    break
+                
+                # Execute instruction
                 try:
-                    self.variables[var_name] = float(value)
-                except:
-                    self.variables[var_name] = value
+                    # Compiled hot loop: runs until it leaves the loop or
+                    # uses up the iteration budget
+                    if op == OP_JIT_LOOP:
+                        loop, original = operands
+                        result = loop(self.variables, self.max_iterations - self.iteration_count)
+                        if result is not None:
+                            pc, iterations = result
+                            self.iteration_count += iterations
+                            if self.iteration_count > self.max_iterations:
+                                self.stop_warning()
+                                break
+                            continue
+                        
+                        # This frame does not fit the compiled loop
+                        op, operands = original
+                    
+                    self.pc = pc
+                    handlers[op](self, operands)
+                    pc = self.pc
+                except Exception as e:
+                    self.flush()
+                    print(f"Error executing: {self.instructions[pc - 1]}")
+                    print(f"Error: {e}")
+                    raise
+        finally:
+            self.pc = pc
+    
+    def count_iteration(self):
+        """Count a loop iteration or call; stop the program past max_iterations"""
+        self.iteration_count += 1
+        if self.iteration_count > self.max_iterations:
+            self.stop_warning()
+            self.pc = len(self.ops)
+    
+    def stop_warning(self):
+        """Report that the max_iterations guard stopped the program"""
+        self.flush()
+        print(f"\nWarning: Stopped after {self.max_iterations} iterations (possible infinite loop)")
+    
+    # Handlers of the decoded instructions, one per opcode (see HANDLERS).
+    # self.pc is already past the instruction when a handler runs.
+    
+    def exec_assign(self, operands):
+        """var = value or var = expr"""
+        self.assign(operands[0], operands[1])
+    
+    def exec_assign_if_false(self, operands):
+        """t = expr; IF_FALSE t GOTO label"""
+        temp, expr, target = operands
+        if not self.assign(temp, expr) and target is not None:
+            self.pc = target
+        else:
+            self.pc += 1
+    
+    def exec_assign_copy(self, operands):
+        """t = expr; var = t"""
+        temp, expr, var_slot = operands
+        value = self.assign(temp, expr)
+        var_type = self.var_types[var_slot]
+        if var_type is not None:
+            value = convert_value(var_type, value)
+        self.store(var_slot, value)
+        self.pc += 1
+    
+    def exec_if_false(self, operands):
+        """IF_FALSE condition GOTO label"""
+        condition, target = operands
+        cond_value = self.get_value(condition)
+        if not cond_value or cond_value == 0:
+            if target is not None:
+                self.pc = target
+    
+    def exec_goto(self, operands):
+        """GOTO label"""
+        target = operands[0]
+        if target is not None:
+            if target < self.pc:
+                if self.jit_threshold is not None:
+                    self.count_back_edge(target)
+                self.pc = target
+                self.count_iteration()
+            else:
+                self.pc = target
+    
+    def exec_print(self, operands):
+        """PRINT variable"""
+        self.write_output(self.get_value(operands[0]))
+    
+    def exec_retval(self, operands):
+        """var = RETVAL"""
+        return_value = self.variables[RETVAL_SLOT]
+        self.variables[operands[0]] = 0 if return_value is None else return_value
+    
+    def exec_push(self, operands):
+        """PUSH value"""
+        self.arg_stack.append(self.get_value(operands[0]))
+    
+    def exec_call(self, operands):
+        """CALL function arg_count"""
+        target, arg_count = operands
         
-        # GOTO label
-        elif instruction.startswith('GOTO'):
-            parts = instruction.split()
-            label = parts[1]
-            if label in self.labels:
-                self.pc = self.labels[label] - 1  # -1 because pc will be incremented
+        # Take this call's arguments off the stack in one slice; they
+        # were pushed right to left, so reverse them into parameter order
+        if arg_count:
+            self.call_args = self.arg_stack[-arg_count:][::-1]
+            del self.arg_stack[-arg_count:]
+        else:
+            self.call_args = []
         
-        # IF_FALSE condition GOTO label
-        elif instruction.startswith('IF_FALSE'):
-            parts = instruction.split()
-            condition = parts[1]
-            label = parts[3]
-            cond_value = self.get_value(condition)
-            if not cond_value or cond_value == 0:
-                if label in self.labels:
-                    self.pc = self.labels[label] - 1
-        
-        # PARAM (function parameter) - pop from arg stack
-        elif instruction.startswith('PARAM'):
-            parts = instruction.split()
-            param_name = parts[1]
-            if self.arg_stack:
-                # Pop arguments (they were pushed in reverse order)
-                value = self.arg_stack.pop(0)
-                self.variables[param_name] = value
-        
-        # PUSH value
-        elif instruction.startswith('PUSH'):
-            parts = instruction.split()
-            value = self.get_value(parts[1])
-            self.arg_stack.append(value)
+        # Save return address and push an empty frame for the callee;
+        # reads that miss it fall back to global_vars (see get_value)
+        self.call_stack.append({
+            'return_addr': self.pc,
+            'scope_depth': len(self.scope_stack)
+        })
+        self.variables = [None] * len(self.global_vars)
+        self.local_stack.append(self.variables)
         
-        # CALL function arg_count
-        elif instruction.startswith('CALL'):
-            parts = instruction.split()
-            func_label = parts[1]
-            arg_count = int(parts[2])
+        # Jump to function
+        if target is not None:
+            self.pc = target
+        self.count_iteration()
+    
+    def exec_param(self, operands):
+        """PARAM name index - bind the index-th argument of the call"""
+        param_slot, index = operands
+        if index < len(self.call_args):
+            self.variables[param_slot] = self.call_args[index]
+    
+    def exec_return(self, operands):
+        """RETURN value"""
+        return_value = 0
+        if operands[0] is not None:
+            return_value = self.get_value(operands[0])
+        
+        # Restore caller's state
+        if self.call_stack:
+            frame = self.call_stack.pop()
+            self.local_stack.pop()
+            self.variables = self.local_stack[-1]
             
-            # Save current state (return address and local variables)
-            return_addr = self.pc + 1
-            saved_vars = dict(self.variables)  # Save current variables
+            # Drop scopes the callee returned from without EXIT_SCOPE
+            del self.scope_stack[frame['scope_depth']:]
             
-            # Push call frame
-            self.call_stack.append({
-                'return_addr': return_addr,
-                'saved_vars': saved_vars
-            })
+            # Store return value
+            self.variables[RETVAL_SLOT] = return_value
             
-            # Jump to function
-            if func_label in self.labels:
-                self.pc = self.labels[func_label]
-        
-        # RETURN value
-        elif instruction.startswith('RETURN'):
-            parts = instruction.split()
-            return_value = 0
+            # Return to caller
+            self.pc = frame['return_addr']
+    
+    def exec_enter_scope(self, operands):
+        """ENTER_SCOPE - start recording the block's declarations"""
+        # Names first declared in this scope, and the outer values of
+        # names it re-declares (shadows)
+        self.scope_stack.append({'declared': set(), 'shadowed': {}})
+    
+    def exec_exit_scope(self, operands):
+        """EXIT_SCOPE - undo the block's declarations"""
+        if self.scope_stack:
+            scope_info = self.scope_stack.pop()
+            variables = self.variables
             
-            if len(parts) > 1:
-                return_value = self.get_value(parts[1])
+            # Variables declared ONLY in this scope are removed
+            for var_slot in scope_info['declared']:
+                variables[var_slot] = None
             
-            # Restore caller's state
-            if self.call_stack:
-                frame = self.call_stack.pop()
-                return_addr = frame['return_addr']
-                self.variables = frame['saved_vars']
-                
-                # Store return value
-                self.variables['RETVAL'] = return_value
-                
-                # Return to caller
-                self.pc = return_addr - 1  # -1 because pc will be incremented
-                return
+            # Shadowed variables get their old value back
+            for var_slot, value in scope_info['shadowed'].items():
+                variables[var_slot] = value
+    
+    def exec_alloc(self, operands):
+        """ALLOC variable type"""
+        var_slot, var_type = operands
         
-        # END_FUNC marker
-        elif instruction.startswith('END_FUNC'):
-            # Skip to next instruction
-            pass
+        # Track variable type
+        self.var_types[var_slot] = var_type
         
-        # Assignment: var = value or var = expr
-        elif '=' in instruction:
-            # Check if it's an assignment (has = but not ==, !=, <=, >=)
-            # Split on first = and check if left side is a single identifier
-            parts = instruction.split('=', 1)
-            if len(parts) == 2:
-                var_name = parts[0].strip()
-                expr = parts[1].strip()
-                
-                # Make sure left side is a valid variable name (not a comparison)
-                if var_name and not any(c in var_name for c in ['<', '>', '!', ' ']):
-                    # Special case for RETVAL
-                    if expr == 'RETVAL':
-                        if 'RETVAL' in self.variables:
-                            self.variables[var_name] = self.variables['RETVAL']
-                        else:
-                            self.variables[var_name] = 0
-                    else:
-                        # Evaluate expression
-                        value = self.evaluate_expression(expr)
-                        
-                        # Type conversion: char to int
-                        if var_name in self.var_types:
-                            target_type = self.var_types[var_name]
-                            
-                            # Convert single character to ASCII value for int variables
-                            if target_type == 'int' and isinstance(value, str) and len(value) == 1:
-                                value = ord(value)
-                            
-                            # Convert int to float for float variables
-                            elif target_type == 'float' and isinstance(value, int):
-                                value = float(value)
-                        
-                        self.variables[var_name] = value
-    
-    def evaluate_expression(self, expr):
-        """Evaluate an expression"""
-        expr = expr.strip()
-        
-        # Binary operations - check in order of precedence
-        # Logical operators (lowest precedence)
-        if '||' in expr:
-            parts = expr.split('||', 1)
-            if len(parts) == 2:
-                left = self.get_value(parts[0].strip())
-                right = self.get_value(parts[1].strip())
-                return 1 if (left or right) else 0
-        
-        if '&&' in expr:
-            parts = expr.split('&&', 1)
-            if len(parts) == 2:
-                left = self.get_value(parts[0].strip())
-                right = self.get_value(parts[1].strip())
-                return 1 if (left and right) else 0
-        
-        # Comparison operators (check these first as they contain other operators)
-        for op in ['<=', '>=', '==', '!=']:
-            if op in expr:
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
-                    left = self.get_value(parts[0].strip())
-                    right = self.get_value(parts[1].strip())
-                    
-                    if op == '<=':
-                        return 1 if left <= right else 0
-                    elif op == '>=':
-                        return 1 if left >= right else 0
-                    elif op == '==':
-                        return 1 if left == right else 0
-                    elif op == '!=':
-                        return 1 if left != right else 0
-        
-        # Single character comparison operators
-        for op in ['<', '>']:
-            if op in expr:
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
-                    left = self.get_value(parts[0].strip())
-                    right = self.get_value(parts[1].strip())
-                    
-                    if op == '<':
-                        return 1 if left < right else 0
-                    elif op == '>':
-                        return 1 if left > right else 0
-        
-        # Arithmetic operators
-        for op in ['+', '-', '*', '/', '%']:
-            if op in expr:
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
-                    left = self.get_value(parts[0].strip())
-                    right = self.get_value(parts[1].strip())
-                    
-                    if op == '+':
-                        return left + right
-                    elif op == '-':
-                        return left - right
-                    elif op == '*':
-                        return left * right
-                    elif op == '/':
-                        return left / right if right != 0 else 0
-                    elif op == '%':
-                        return left % right if right != 0 else 0
-        
-        # Unary operations
-        if expr.startswith('-'):
-            return -self.get_value(expr[1:].strip())
-        if expr.startswith('!'):
-            return 0 if self.get_value(expr[1:].strip()) else 1
+        # Record the declaration in the innermost scope
+        if self.scope_stack:
+            scope_info = self.scope_stack[-1]
+            declared = scope_info['declared']
+            shadowed = scope_info['shadowed']
+            if var_slot not in declared and var_slot not in shadowed:
+                if self.variables[var_slot] is not None:
+                    shadowed[var_slot] = self.variables[var_slot]
+                else:
+                    declared.add(var_slot)
         
-        # Single value
-        return self.get_value(expr)
+        self.variables[var_slot] = 0  # Initialize to 0
     
-    def get_value(self, token):
-        """Get value of a token (variable or literal)"""
-        token = token.strip()
+    def exec_read(self, operands):
+        """READ variable"""
+        var_slot = operands[0]
+        self.store(var_slot, self.read_value(self.slot_names[var_slot]))
+    
+    # Opcode -> handler; NOP, END_MAIN and JIT_LOOP are handled by run()
+    HANDLERS = [None] * NUM_OPCODES
+    HANDLERS[OP_ASSIGN] = exec_assign
+    HANDLERS[OP_ASSIGN_IF_FALSE] = exec_assign_if_false
+    HANDLERS[OP_ASSIGN_COPY] = exec_assign_copy
+    HANDLERS[OP_IF_FALSE] = exec_if_false
+    HANDLERS[OP_GOTO] = exec_goto
+    HANDLERS[OP_PRINT] = exec_print
+    HANDLERS[OP_RETVAL] = exec_retval
+    HANDLERS[OP_PUSH] = exec_push
+    HANDLERS[OP_CALL] = exec_call
+    HANDLERS[OP_PARAM] = exec_param
+    HANDLERS[OP_RETURN] = exec_return
+    HANDLERS[OP_ENTER_SCOPE] = exec_enter_scope
+    HANDLERS[OP_EXIT_SCOPE] = exec_exit_scope
+    HANDLERS[OP_ALLOC] = exec_alloc
+    HANDLERS[OP_READ] = exec_read
+    HANDLERS = tuple(HANDLERS)
+    
+    def assign(self, var_slot, expr):
+        """Evaluate a parsed expression into a variable; returns the stored value"""
+        value = self.eval_parsed(expr)
+        
+        # Type conversion: char to int, int to float
+        var_type = self.var_types[var_slot]
+        if var_type is not None:
+            value = convert_value(var_type, value)
         
-        # Try as number
+        self.store(var_slot, value)
+        return value
+    
+    def store(self, var_slot, value):
+        """
+        Assign a variable: in the current frame if it is defined there,
+        else in global_vars if it is a global, else as a new local
+        """
+        variables = self.variables
+        if variables[var_slot] is None and self.global_vars[var_slot] is not None:
+            variables = self.global_vars
+        variables[var_slot] = value
+    
+    def write_output(self, value):
+        """Record a PRINTed value and buffer its output line"""
+        if value.__class__ is bool:
+            value = int(value)  # Comparison result (see BINOP_TABLE)
+        self.output.append(value)
+        if not self.quiet:
+            line = OUTPUT_LINE(value)
+            self.output_buffer.append(line)
+            self.output_buffer_size += len(line)
+            if self.output_buffer_size >= self.flush_threshold:
+                self.flush()
+    
+    def read_value(self, var_name):
+        """Prompt for a value: int, then float, else the raw string"""
+        self.flush()  # Show pending output before prompting
+        value = input(f"Input {var_name}: ")
+        try:
+            return int(value)
+        except:
+            try:
+                return float(value)
+            except:
+                return value
+    
+    def flush(self):
+        """Write buffered PRINT output to stdout"""
+        if self.output_buffer:
+            sys.stdout.write(''.join(self.output_buffer))
+            self.output_buffer.clear()
+            self.output_buffer_size = 0
+    
+    def parse_expression(self, expr):
+        """
+        Parse the right-hand side of a TAC assignment once, into
+        (EXPR_BINOP, op_code, left, right), (EXPR_NEG, operand),
+        (EXPR_NOT, operand) or (EXPR_VALUE, operand), with every
+        operand classified by classify_token. Expressions of literals
+        only are computed here and become a single literal value.
+        """
+        classify = self.classify_token
+        operands = TAC_OPERAND.findall(expr)
+        
+        # Binary operation: left op right
+        if len(operands) == 3 and operands[1] in BINOP_CODES:
+            parsed = (EXPR_BINOP, BINOP_CODES[operands[1]],
+                      classify(operands[0]), classify(operands[2]))
+        
+        # Unary operations (a negative literal is a single value)
+        elif len(operands) == 1 and operands[0][0] == '-' and self.literal_value(operands[0]) is None:
+            parsed = (EXPR_NEG, classify(operands[0][1:]))
+        elif len(operands) == 1 and operands[0][0] == '!':
+            parsed = (EXPR_NOT, classify(operands[0][1:]))
+        
+        # Single value
+        else:
+            return (EXPR_VALUE, classify(expr.strip()))
+        
+        # Fold literal-only expressions
+        if all(tag == TAG_LIT for tag, _ in expression_operands(parsed)):
+            try:
+                return (EXPR_VALUE, (TAG_LIT, self.eval_parsed(parsed)))
+            except Exception:
+                pass  # Left for run time, where the error is reported
+        return parsed
+    
+    def eval_parsed(self, expr):
+        """Evaluate an expression produced by parse_expression"""
+        kind = expr[0]
+        get_value = self.get_value
+        if kind == EXPR_BINOP:
+            return BINOP_TABLE[expr[1]](get_value(expr[2]), get_value(expr[3]))
+        if kind == EXPR_VALUE:
+            return get_value(expr[1])
+        if kind == EXPR_NEG:
+            return 0 - get_value(expr[1])
+        return 0 if get_value(expr[1]) else 1
+    
+    def literal_value(self, token):
+        """Value of a numeric or char literal token, None for variables"""
         try:
             if '.' in token:
                 return float(token)
             return int(token)
-        except:
+        except ValueError:
             pass
+        if len(token) >= 2 and token.startswith("'") and token.endswith("'"):
+            return token[1:-1]
+        return None
+    
+    def classify_token(self, token):
+        """
+        Classify an operand token once, as (TAG_LIT, value) for number
+        and char literals or (TAG_VAR, slot) for variables
+        """
+        token = token.strip()
+        literal = self.literal_value(token)
+        if literal is not None:
+            return (TAG_LIT, literal)
+        return (TAG_VAR, self.slot(token))
+    
+    def get_value(self, operand):
+        """Get value of a classified operand (literal or variable)"""
+        tag, value = operand
+        if tag == TAG_LIT:
+            return value
         
-        # Try as variable
-        if token in self.variables:
-            return self.variables[token]
+        # Variable: current frame first, then globals, unknown - 0
+        result = self.variables[value]
+        if result is None:
+            result = self.global_vars[value]
+            if result is None:
+                return 0
+        return result
+    
+    def count_back_edge(self, header):
+        """Count a jump back to a loop header; compile the loop once it is hot"""
+        count = self.back_edge_counts.get(header, 0) + 1
+        self.back_edge_counts[header] = count
+        if count != self.jit_threshold:
+            return
         
-        # Try as char literal
-        if token.startswith("'") and token.endswith("'"):
-            return token[1:-1]
+        loop = self.jit_compile(header, self.pc - 1)
+        if loop is not None:
+            self.jit_cache[header] = loop
+            self.args[header] = (loop, (self.ops[header], self.args[header]))
+            self.ops[header] = OP_JIT_LOOP
+    
+    def jit_compile(self, header, back_edge):
+        """
+        Compile the hot loop at PCs header..back_edge (ending in
+        GOTO header) into a Python function loop(frame, budget) ->
+        (pc, iterations) working directly on the frame and global_vars.
+        Returns None if the loop uses anything the JIT does not handle
+        (calls, READ, inner loops, jumps out of a block scope); it then
+        stays interpreted.
+        
+        Inside a function the loop is specialized to which names the
+        current frame defines; a later call whose frame differs gets
+        None back from loop() and interprets the loop instead.
+        """
+        try:
+            source = self._jit_source(header, back_edge)
+        except ValueError:
+            return None
         
-        # Unknown - return 0
-        return 0
+        namespace = {}
+        exec(compile('\n'.join(source), f'<jit {header}>', 'exec'), namespace)
+        return namespace['_make'](self.global_vars, self.write_output, as_int, as_float)
+    
+    def _jit_source(self, header, back_edge):
+        """Python source for jit_compile; raises ValueError if unsupported"""
+        ops = self.ops
+        args = self.args
+        global_vars = self.global_vars
+        frame = self.variables
+        referenced = set()  # Slots the loop reads or writes
+        entry_reads = set()  # Slots read before the loop writes them
+        
+        def is_global(var_slot):
+            # Names a function does not define resolve to MAIN's variables
+            return (frame is not global_vars and frame[var_slot] is None
+                    and global_vars[var_slot] is not None)
+        
+        def slot(var_name):
+            var_slot = self.slots[var_name]
+            return f"g[{var_slot}]" if is_global(var_slot) else f"f[{var_slot}]"
+        
+        def read(operand):
+            # Reads must not see an undefined (None) slot
+            tag, value = operand
+            if tag == TAG_VAR:
+                referenced.add(value)
+                if value not in defined and not any(value in scope for scope in scopes):
+                    if frame[value] is None and global_vars[value] is None:
+                        raise ValueError(f"Possibly undefined variable '{self.slot_names[value]}'")
+                    entry_reads.add(value)
+            return self._py_operand(operand, slot)
+        
+        def store(var_slot, parsed):
+            for operand in expression_operands(parsed):
+                read(operand)
+            value = self._py_parsed(parsed, slot)
+            var_type = self.var_types[var_slot]
+            if parsed[0] == EXPR_VALUE and parsed[1][0] == TAG_LIT:
+                value = repr(convert_value(var_type, parsed[1][1]))
+            elif var_type in ('int', 'float'):
+                value = f"_as_{var_type}({value})"
+            code.append(f"{slot(self.slot_names[var_slot])} = {value}")
+            referenced.add(var_slot)
+            defined.add(var_slot)
+        
+        def jump(target, pc):
+            # Source lines for a jump from pc to target (None: no jump)
+            if target is None:
+                return []
+            if target == header:
+                return ["n += 1",
+                        "if n > budget:",
+                        f"    return ({header}, n)",
+                        f"b = {header}",
+                        "continue"]
+            if header < target <= back_edge:
+                if target <= pc:
+                    raise ValueError("Inner loop")
+                return [f"b = {target}"]
+            if scopes:
+                raise ValueError("Jump out of a block scope")
+            return [f"return ({target}, n)"]
+        
+        # Blocks start at the header, at jump targets inside the loop and
+        # after every conditional branch
+        starts = {header}
+        for pc in range(header, back_edge + 1):
+            op, operands = ops[pc], args[pc]
+            if op in (OP_IF_FALSE, OP_GOTO, OP_ASSIGN_IF_FALSE):
+                target = operands[-1]
+                if target is not None and header < target <= back_edge:
+                    starts.add(target)
+            if op == OP_IF_FALSE:
+                starts.add(pc + 1)
+            elif op == OP_ASSIGN_IF_FALSE:
+                starts.add(pc + 2)
+        
+        lines = []
+        code = []
+        scopes = []  # Per open block scope: var slot -> name of its saved value
+        defined = set()  # Slots written earlier in the current block
+        terminated = False  # Current block ends in an unconditional jump
+        pc = header
+        while pc <= back_edge:
+            op, operands = ops[pc], args[pc]
+            if pc in starts:
+                if pc != header:
+                    if not terminated:
+                        code.append(f"b = {pc}")
+                    lines.extend("                " + line for line in code)
+                lines.append(f"            if b == {pc}:")
+                code = []
+                defined = set()
+                terminated = False
+            elif terminated:
+                # Unreachable: after a GOTO and not a jump target
+                pc += 1
+                continue
+            pc += 1
+            
+            if op == OP_NOP:
+                continue
+            if op == OP_ASSIGN:
+                store(*operands)
+            elif op == OP_ASSIGN_COPY:
+                temp, expr, var_slot = operands
+                store(temp, expr)
+                store(var_slot, (EXPR_VALUE, (TAG_VAR, temp)))
+                pc += 1
+            elif op == OP_ASSIGN_IF_FALSE or op == OP_IF_FALSE:
+                if op == OP_ASSIGN_IF_FALSE:
+                    temp, expr, target = operands
+                    store(temp, expr)
+                    condition = slot(self.slot_names[temp])
+                    pc += 1
+                else:
+                    condition, target = read(operands[0]), operands[1]
+                taken = jump(target, pc - 1)
+                if len(taken) == 1 and taken[0].startswith("b = "):
+                    # Forward jump inside the loop: pick the next block
+                    code.append(f"{taken[0]} if not {condition} else {pc}")
+                    terminated = True
+                elif taken:
+                    code.append(f"if not {condition}:")
+                    code.extend("    " + line for line in taken)
+            elif op == OP_GOTO:
+                code.extend(jump(operands[0], pc - 1))
+                terminated = True
+            elif op == OP_PRINT:
+                code.append(f"_out({read(operands[0])})")
+            elif op == OP_ENTER_SCOPE:
+                scopes.append({})
+            elif op == OP_EXIT_SCOPE:
+                if not scopes:
+                    raise ValueError("EXIT_SCOPE of an outer scope")
+                for var_slot, save in scopes.pop().items():
+                    code.append(f"f[{var_slot}] = {save}")
+                    defined.discard(var_slot)
+            elif op == OP_ALLOC:
+                var_slot, var_type = operands
+                if not scopes or self.var_types[var_slot] != var_type or is_global(var_slot):
+                    raise ValueError("ALLOC outside a block scope, of a global or changing a type")
+                if var_slot not in scopes[-1]:
+                    # Shadowed (or undefined) value comes back at EXIT_SCOPE
+                    scopes[-1][var_slot] = f"save_{pc - 1}"
+                    code.append(f"save_{pc - 1} = f[{var_slot}]")
+                code.append(f"f[{var_slot}] = 0")
+                referenced.add(var_slot)
+                defined.add(var_slot)
+            else:
+                raise ValueError(f"Unsupported instruction in loop: {self.instructions[pc - 1]}")
+        
+        lines.extend("                " + line for line in code)
+        
+        # Entry check (functions only): every slot must resolve to the
+        # same frame as when the loop was compiled
+        checks = []
+        if frame is not global_vars:
+            for var_slot in sorted(referenced):
+                if is_global(var_slot):
+                    checks.append(f"f[{var_slot}] is not None or g[{var_slot}] is None")
+                elif var_slot in entry_reads:
+                    checks.append(f"f[{var_slot}] is None")
+                else:
+                    checks.append(f"(f[{var_slot}] is None and g[{var_slot}] is not None)")
+        
+        header_lines = ["def _make(g, _out, _as_int, _as_float):",
+                        "    def loop(f, budget):"]
+        if checks:
+            header_lines.append(f"        if {' or '.join(checks)}:")
+            header_lines.append("            return None")
+        header_lines += ["        n = 0",
+                         f"        b = {header}",
+                         "        while True:"]
+        return header_lines + lines + ["    return loop"]
+    
+    def compile_to_python(self, tac_code):
+        """
+        Compile TAC ahead of time into Python and return a callable that
+        runs the program and returns self.output.
+        
+        MAIN and every FUNC_ routine become one Python function whose
+        variables live in a slot list and labels become blocks of a pc
+        dispatch loop. A routine whose calls can reach recursion is a
+        generator: its CALLs to other such routines yield the callee to
+        drive(), so deep recursion does not hit Python's stack limit. Backward jumps and calls count against
+        max_iterations as in execute(). PRINT and READ go through the
+        interpreter's write_output / read_value.
+        """
+        instructions = [line.strip() for line in tac_code]
+        
+        # Declared types of every ALLOCated name (for assignment conversion)
+        var_types = {}
+        for instruction in instructions:
+            parts = instruction.split()
+            if len(parts) > 1 and parts[0] == 'ALLOC':
+                var_types.setdefault(parts[1], set()).add(parts[2] if len(parts) > 2 else 'int')
+        
+        # Split the program into routines: MAIN ... END_MAIN, FUNC_f ... END_FUNC_f
+        routines = []
+        start = None
+        for i, instruction in enumerate(instructions):
+            if instruction == 'MAIN:' or (instruction.startswith('FUNC_') and instruction.endswith(':')):
+                start = i
+            elif start is not None and (instruction == 'END_MAIN' or instruction.startswith('END_FUNC')):
+                routines.append((instructions[start][:-1], instructions[start + 1:i]))
+                start = None
+        
+        routine_names = {name for name, _ in routines}
+        if 'MAIN' not in routine_names:
+            raise ValueError("No MAIN label found")
+        # Routines compiled as generators (see drive): those that call
+        # another generator. Starting from every routine with a CALL, drop
+        # the ones whose callees are all plain functions until none
+        # changes; what remains can reach recursion, the rest are called
+        # directly (their depth is bounded by the number of routines)
+        callees = {name: {instruction.split()[1] for instruction in body
+                          if instruction.startswith('CALL ')}
+                   for name, body in routines}
+        callers = {name for name, called in callees.items() if called}
+        changed = True
+        while changed:
+            changed = False
+            for name in list(callers):
+                if not callees[name] & callers:
+                    callers.discard(name)
+                    changed = True
+        
+        source = ["def _make(_out, _read, _as_int, _as_float, _convert, _limit, _Stop):",
+                  "    _types = {}",
+                  "    _n = 0  # Backward jumps and calls so far"]
+        for name, body in routines:
+            source.extend(self._compile_routine(name, body, routine_names, var_types, callers))
+        source.append("    return _r_MAIN")
+        
+        namespace = {}
+        exec(compile('\n'.join(source), '<tac>', 'exec'), namespace)
+        main = namespace['_make'](self.write_output, self.read_value, as_int, as_float, convert_value,
+                                  self.max_iterations, IterationLimit)
+        
+        def run():
+            try:
+                if 'MAIN' in callers:
+                    drive(main())
+                else:
+                    main()
+            except IterationLimit:
+                self.stop_warning()
+            finally:
+                self.flush()
+            return self.output
+        
+        return run
+    
+    def _compile_routine(self, name, body, routine_names, var_types, callers):
+        """Python source lines for one TAC routine (see compile_to_python)"""
+        slots = {}
+        
+        def slot(var_name):
+            if var_name not in slots:
+                slots[var_name] = len(slots)
+            return f"s[{slots[var_name]}]"
+        
+        def ends_block(parts):
+            return parts[0] in ('GOTO', 'IF_FALSE') or (parts[0] == 'RETURN' and name != 'MAIN')
+        
+        # Blocks start at labels and after every jump or return
+        block_of_label = {}
+        block_count = 1
+        for i, instruction in enumerate(body):
+            parts = instruction.split()
+            if instruction.endswith(':'):
+                block_count += 1
+                block_of_label[instruction[:-1]] = block_count - 1
+            elif parts and ends_block(parts) and i + 1 < len(body) and not body[i + 1].endswith(':'):
+                block_count += 1
+        
+        def jump(label, current):
+            target = block_of_label.get(label)
+            if target is None:
+                raise ValueError(f"Unknown label '{label}' in {name}")
+            if target <= current:
+                return COUNT_ITERATION + [f"pc = {target}", "continue"]
+            return [f"pc = {target}"]
+        
+        blocks = [[]]
+        terminated = False  # Current block ends in a jump or return
+        scopes = []  # Per open scope: (var slot, save slot) of each ALLOC
+        pending_args = []  # PUSHed operands waiting for their CALL
+        params = 0
+        
+        for i, instruction in enumerate(body):
+            current = len(blocks) - 1
+            code = blocks[-1]
+            parts = instruction.split()
+            if not parts:
+                continue
+            op = parts[0]
+            
+            if instruction.endswith(':'):
+                if not terminated:
+                    code.append(f"pc = {current + 1}")
+                blocks.append([])
+                terminated = False
+                continue
+            
+            if len(parts) > 1 and parts[1] == '=':
+                var_name = parts[0]
+                expr = instruction.split('=', 1)[1].strip()
+                if expr == 'RETVAL':
+                    code.append(f"{slot(var_name)} = {slot('RETVAL')}")
+                    continue
+                value = self._py_expression(expr, slot)
+                types = var_types.get(var_name)
+                if types and len(types) > 1:
+                    value = f"_convert(_types.get({var_name!r}), {value})"
+                elif types:
+                    var_type = next(iter(types))
+                    literal = self.literal_value(expr)
+                    if literal is not None:
+                        value = repr(convert_value(var_type, literal))
+                    elif var_type in ('int', 'float'):
+                        value = f"_as_{var_type}({value})"
+                code.append(f"{slot(var_name)} = {value}")
+                continue
+            
+            if op == 'ENTER_SCOPE':
+                scopes.append([])
+            elif op == 'EXIT_SCOPE':
+                if scopes:
+                    for var_slot, save_slot in reversed(scopes.pop()):
+                        code.append(f"{var_slot} = {save_slot}")
+            elif op == 'ALLOC':
+                var_slot = slot(parts[1])
+                if scopes:
+                    # Shadowed (or not yet declared) value comes back at EXIT_SCOPE
+                    save_slot = slot((parts[1], i))
+                    code.append(f"{save_slot} = {var_slot}")
+                    scopes[-1].append((var_slot, save_slot))
+                if len(var_types.get(parts[1], ())) > 1:
+                    code.append(f"_types[{parts[1]!r}] = {parts[2] if len(parts) > 2 else 'int'!r}")
+                code.append(f"{var_slot} = 0")
+            elif op == 'PRINT':
+                code.append(f"_out({self._py_operand(self.classify_token(parts[1]), slot)})")
+            elif op == 'READ':
+                code.append(f"{slot(parts[1])} = _read({parts[1]!r})")
+            elif op == 'PARAM':
+                index = int(parts[2]) if len(parts) > 2 else params
+                params = max(params, index + 1)
+                code.append(f"{slot(parts[1])} = p{index}")
+            elif op == 'PUSH':
+                pending_args.append(self._py_operand(self.classify_token(parts[1]), slot))
+            elif op == 'CALL':
+                if parts[1] not in routine_names:
+                    raise ValueError(f"Unknown function '{parts[1]}' in {name}")
+                arg_count = int(parts[2])
+                # Arguments were pushed right to left
+                args = pending_args[len(pending_args) - arg_count:]
+                del pending_args[len(pending_args) - arg_count:]
+                code.extend(COUNT_ITERATION)
+                call = f"_r_{parts[1]}({', '.join(reversed(args))})"
+                if parts[1] in callers:
+                    # Run by drive() on its frame stack
+                    call = f"(yield (_r_{parts[1]}, ({''.join(arg + ', ' for arg in reversed(args))})))"
+                code.append(f"{slot('RETVAL')} = {call}")
+            elif op == 'GOTO':
+                code.extend(jump(parts[1], current))
+            elif op == 'IF_FALSE':
+                condition = self._py_operand(self.classify_token(parts[1]), slot)
+                target = jump(parts[3], current)
+                if len(target) == 1:
+                    code.append(f"{target[0]} if not {condition} else {current + 1}")
+                else:
+                    code.append(f"if not {condition}:")
+                    code.extend("    " + line for line in target)
+                    code.append(f"pc = {current + 1}")
+            elif op == 'RETURN' and name != 'MAIN':
+                value = self._py_operand(self.classify_token(parts[1]), slot) if len(parts) > 1 else '0'
+                code.append(f"return {value}")
+            
+            if ends_block(parts):
+                terminated = True
+                if i + 1 < len(body) and not body[i + 1].endswith(':'):
+                    blocks.append([])
+                    terminated = False
+        
+        if not terminated or parts[0] == 'IF_FALSE':
+            if terminated:
+                blocks.append([])
+            blocks[-1].append("return" if name == 'MAIN' else "return 0")
+        
+        signature = ', '.join(f"p{i}=0" for i in range(params))
+        lines = [f"    def _r_{name}({signature}):",
+                 "        nonlocal _n",
+                 f"        s = [0] * {max(len(slots), 1)}",
+                 "        pc = 0",
+                 "        while True:"]
+        for index, code in enumerate(blocks):
+            lines.append(f"            if pc == {index}:")
+            lines.extend("                " + line for line in code)
+        return lines
+    
+    def _py_operand(self, operand, slot):
+        """Python source for a classified operand: a literal or a variable slot"""
+        tag, value = operand
+        if tag == TAG_LIT:
+            return repr(value)
+        return slot(self.slot_names[value])
+    
+    def _py_expression(self, expr, slot):
+        """Python source for the right-hand side of a TAC assignment"""
+        return self._py_parsed(self.parse_expression(expr), slot)
+    
+    def _py_parsed(self, parsed, slot):
+        """Python source for an expression produced by parse_expression"""
+        kind = parsed[0]
+        if kind == EXPR_BINOP:
+            left = self._py_operand(parsed[2], slot)
+            right = self._py_operand(parsed[3], slot)
+            return PY_BINARY_OPS[BINARY_OPERATORS[parsed[1]]].format(left, right)
+        if kind == EXPR_NEG:
+            return f"(0 - {self._py_operand(parsed[1], slot)})"
+        if kind == EXPR_NOT:
+            return f"(0 if {self._py_operand(parsed[1], slot)} else 1)"
+        return self._py_operand(parsed[1], slot)
 
 
 def main():
     """Test the interpreter"""
-    import sys
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    quiet = '--quiet' in flags
     
-    if len(sys.argv) < 2:
-        print("Usage: python interpreter.py <tac_file>")
+    if not args:
+        print("Usage: python interpreter.py <tac_file> [--quiet] [--compile]")
         sys.exit(1)
     
-    tac_file = sys.argv[1]
+    tac_file = args[0]
     
     try:
         with open(tac_file, 'r') as f:
@@ -371,8 +1187,11 @@ def main():
         print("TAC INTERPRETER - EXECUTION STARTED")
         print("="*60 + "\n")
         
-        interpreter = TACInterpreter()
-        output = interpreter.execute(tac_code)
+        interpreter = TACInterpreter(quiet=quiet)
+        if '--compile' in flags:
+            output = interpreter.compile_to_python(tac_code)()
+        else:
+            output = interpreter.execute(tac_code)
         
         print("\n" + "="*60)
         print("EXECUTION COMPLETED")
@@ -4,7 +4,9 @@ Converts source code into tokens
 """
 
 import re
+from bisect import bisect_left
 from enum import Enum, auto
+from sys import intern
 
 class TokenType(Enum):
     # Keywords
@@ -59,7 +61,72 @@ class TokenType(Enum):
     EOF = auto()
     NEWLINE = auto()
 
+# One pattern for every token kind, preceded by any whitespace and
+# comments to skip; group names select the action in tokenize(), ERROR
+# catches any other character and END the trailing whitespace. As one of
+# the alternatives always matches, the skip part never backtracks.
+TOKEN_PATTERN = re.compile(r"""
+    (?:[ \t\r\n]|//[^\n]*)*
+    (?:
+    (?P<NUMBER>\d+(?:\.\d*)?)
+  | (?P<IDENTIFIER>[^\W\d]\w*)
+  | (?P<CHAR>'.')
+  | (?P<BAD_CHAR>'.?)
+  | (?P<OPERATOR>==|!=|<=|>=|&&|\|\||[-+*/%=<>!(){};,])
+  | (?P<ERROR>.)
+  | (?P<END>\Z)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+# Reserved words and their token types
+KEYWORDS = {
+    'int': TokenType.INT,
+    'float': TokenType.FLOAT,
+    'char': TokenType.CHAR,
+    'void': TokenType.VOID,
+    'if': TokenType.IF,
+    'elif': TokenType.ELIF,
+    'else': TokenType.ELSE,
+    'loop': TokenType.LOOP,
+    'from': TokenType.FROM,
+    'to': TokenType.TO,
+    'step': TokenType.STEP,
+    'show': TokenType.SHOW,
+    'tell': TokenType.TELL,
+    'return': TokenType.RETURN,
+    'func': TokenType.FUNC,
+}
+
+NEWLINE = re.compile('\n')
+
+# Operators and delimiters
+OPERATOR_TOKENS = {
+    '==': TokenType.EQ,
+    '!=': TokenType.NEQ,
+    '<=': TokenType.LTE,
+    '>=': TokenType.GTE,
+    '&&': TokenType.AND,
+    '||': TokenType.OR,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '%': TokenType.MODULO,
+    '=': TokenType.ASSIGN,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+    '!': TokenType.NOT,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    ';': TokenType.SEMICOLON,
+    ',': TokenType.COMMA,
+}
+
 class Token:
+    __slots__ = ('type', 'value', 'line', 'column')
+    
     def __init__(self, type, value, line, column):
         self.type = type
         self.value = value
@@ -77,209 +144,67 @@ class Lexer:
         self.column = 1
         self.tokens = []
         self.errors = []
-        
-        self.keywords = {
-            'int': TokenType.INT,
-            'float': TokenType.FLOAT,
-            'char': TokenType.CHAR,
-            'void': TokenType.VOID,
-            'if': TokenType.IF,
-            'elif': TokenType.ELIF,
-            'else': TokenType.ELSE,
-            'loop': TokenType.LOOP,
-            'from': TokenType.FROM,
-            'to': TokenType.TO,
-            'step': TokenType.STEP,
-            'show': TokenType.SHOW,
-            'tell': TokenType.TELL,
-            'return': TokenType.RETURN,
-            'func': TokenType.FUNC,
-        }
-    
-    def current_char(self):
-        if self.pos >= len(self.source):
-            return None
-        return self.source[self.pos]
+        self.newlines = []  # Offsets of every '\n' in the source (see line_col)
     
-    def peek_char(self, offset=1):
-        pos = self.pos + offset
-        if pos >= len(self.source):
-            return None
-        return self.source[pos]
-    
-    def advance(self):
-        if self.pos < len(self.source):
-            if self.source[self.pos] == '\n':
-                self.line += 1
-                self.column = 1
-            else:
-                self.column += 1
-            self.pos += 1
-    
-    def skip_whitespace(self):
-        while self.current_char() and self.current_char() in ' \t\r\n':
-            self.advance()
-    
-    def skip_comment(self):
-        # Single line comment: //
-        if self.current_char() == '/' and self.peek_char() == '/':
-            while self.current_char() and self.current_char() != '\n':
-                self.advance()
-            return True
-        return False
-    
-    def read_number(self):
-        start_col = self.column
-        num_str = ''
-        is_float = False
-        
-        while self.current_char() and (self.current_char().isdigit() or self.current_char() == '.'):
-            if self.current_char() == '.':
-                if is_float:
-                    self.errors.append(f"Lexical Error at {self.line}:{self.column}: Invalid number format")
-                    break
-                is_float = True
-            num_str += self.current_char()
-            self.advance()
-        
-        if is_float:
-            return Token(TokenType.FLOAT_LITERAL, float(num_str), self.line, start_col)
-        else:
-            return Token(TokenType.INTEGER_LITERAL, int(num_str), self.line, start_col)
-    
-    def read_identifier(self):
-        start_col = self.column
-        id_str = ''
-        
-        while self.current_char() and (self.current_char().isalnum() or self.current_char() == '_'):
-            id_str += self.current_char()
-            self.advance()
-        
-        token_type = self.keywords.get(id_str, TokenType.IDENTIFIER)
-        return Token(token_type, id_str, self.line, start_col)
-    
-    def read_char_literal(self):
-        start_col = self.column
-        self.advance()  # Skip opening '
-        
-        if not self.current_char():
-            self.errors.append(f"Lexical Error at {self.line}:{start_col}: Unterminated char literal")
-            return None
-        
-        char_value = self.current_char()
-        self.advance()
-        
-        if self.current_char() != "'":
-            self.errors.append(f"Lexical Error at {self.line}:{start_col}: Char literal must be single character")
-            return None
-        
-        self.advance()  # Skip closing '
-        return Token(TokenType.CHAR_LITERAL, char_value, self.line, start_col)
+    def line_col(self, offset):
+        """(line, column) of a source offset, from the newline offsets"""
+        index = bisect_left(self.newlines, offset)
+        if index:
+            return index + 1, offset - self.newlines[index - 1]
+        return 1, offset + 1
     
     def tokenize(self):
-        while self.pos < len(self.source):
-            self.skip_whitespace()
-            
-            if self.pos >= len(self.source):
+        source = self.source
+        tokens = self.tokens
+        line_col = self.line_col
+        self.newlines = [m.start() for m in NEWLINE.finditer(source)]
+        
+        # Every match is whitespace/comments plus one token, so the
+        # matches cover the source back to back
+        for m in TOKEN_PATTERN.finditer(source, self.pos):
+            kind = m.lastgroup
+            if kind == 'END':
                 break
             
-            # Skip comments
-            if self.skip_comment():
-                continue
-            
-            char = self.current_char()
-            col = self.column
+            start, end = m.span(kind)
+            line, col = line_col(start)
             
-            # Numbers
-            if char.isdigit():
-                self.tokens.append(self.read_number())
+            # Token text is sliced once
+            text = source[start:end]
             
             # Identifiers and Keywords
-            elif char.isalpha() or char == '_':
-                self.tokens.append(self.read_identifier())
+            if kind == 'IDENTIFIER':
+                token_type = KEYWORDS.get(text, TokenType.IDENTIFIER)
+                tokens.append(Token(token_type, intern(text), line, col))
             
-            # Char literals
-            elif char == "'":
-                token = self.read_char_literal()
-                if token:
-                    self.tokens.append(token)
+            elif kind == 'OPERATOR':
+                tokens.append(Token(OPERATOR_TOKENS[text], text, line, col))
             
-            # Two-character operators
-            elif char == '=' and self.peek_char() == '=':
-                self.tokens.append(Token(TokenType.EQ, '==', self.line, col))
-                self.advance()
-                self.advance()
-            elif char == '!' and self.peek_char() == '=':
-                self.tokens.append(Token(TokenType.NEQ, '!=', self.line, col))
-                self.advance()
-                self.advance()
-            elif char == '<' and self.peek_char() == '=':
-                self.tokens.append(Token(TokenType.LTE, '<=', self.line, col))
-                self.advance()
-                self.advance()
-            elif char == '>' and self.peek_char() == '=':
-                self.tokens.append(Token(TokenType.GTE, '>=', self.line, col))
-                self.advance()
-                self.advance()
-            elif char == '&' and self.peek_char() == '&':
-                self.tokens.append(Token(TokenType.AND, '&&', self.line, col))
-                self.advance()
-                self.advance()
-            elif char == '|' and self.peek_char() == '|':
-                self.tokens.append(Token(TokenType.OR, '||', self.line, col))
-                self.advance()
-                self.advance()
+            # Numbers (a second '.' right after a float is an error)
+            elif kind == 'NUMBER':
+                if '.' in text:
+                    tokens.append(Token(TokenType.FLOAT_LITERAL, float(text), line, col))
+                    if source.startswith('.', end):
+                        self.errors.append("Lexical Error at {}:{}: Invalid number format".format(*line_col(end)))
+                else:
+                    tokens.append(Token(TokenType.INTEGER_LITERAL, int(text), line, col))
             
-            # Single-character operators and delimiters
-            elif char == '+':
-                self.tokens.append(Token(TokenType.PLUS, '+', self.line, col))
-                self.advance()
-            elif char == '-':
-                self.tokens.append(Token(TokenType.MINUS, '-', self.line, col))
-                self.advance()
-            elif char == '*':
-                self.tokens.append(Token(TokenType.MULTIPLY, '*', self.line, col))
-                self.advance()
-            elif char == '/':
-                self.tokens.append(Token(TokenType.DIVIDE, '/', self.line, col))
-                self.advance()
-            elif char == '%':
-                self.tokens.append(Token(TokenType.MODULO, '%', self.line, col))
-                self.advance()
-            elif char == '=':
-                self.tokens.append(Token(TokenType.ASSIGN, '=', self.line, col))
-                self.advance()
-            elif char == '<':
-                self.tokens.append(Token(TokenType.LT, '<', self.line, col))
-                self.advance()
-            elif char == '>':
-                self.tokens.append(Token(TokenType.GT, '>', self.line, col))
-                self.advance()
-            elif char == '!':
-                self.tokens.append(Token(TokenType.NOT, '!', self.line, col))
-                self.advance()
-            elif char == '(':
-                self.tokens.append(Token(TokenType.LPAREN, '(', self.line, col))
-                self.advance()
-            elif char == ')':
-                self.tokens.append(Token(TokenType.RPAREN, ')', self.line, col))
-                self.advance()
-            elif char == '{':
-                self.tokens.append(Token(TokenType.LBRACE, '{', self.line, col))
-                self.advance()
-            elif char == '}':
-                self.tokens.append(Token(TokenType.RBRACE, '}', self.line, col))
-                self.advance()
-            elif char == ';':
-                self.tokens.append(Token(TokenType.SEMICOLON, ';', self.line, col))
-                self.advance()
-            elif char == ',':
-                self.tokens.append(Token(TokenType.COMMA, ',', self.line, col))
-                self.advance()
+            # Char literals (reported on the line after the quoted
+            # character, which matters only when it is a newline)
+            elif kind == 'CHAR':
+                line = line_col(start + 2)[0]
+                tokens.append(Token(TokenType.CHAR_LITERAL, text[1], line, col))
+            elif kind == 'BAD_CHAR':
+                if len(text) == 1:
+                    self.errors.append(f"Lexical Error at {line}:{col}: Unterminated char literal")
+                else:
+                    line = line_col(end)[0]
+                    self.errors.append(f"Lexical Error at {line}:{col}: Char literal must be single character")
             
             else:
-                self.errors.append(f"Lexical Error at {self.line}:{col}: Unknown character '{char}'")
-                self.advance()
+                self.errors.append(f"Lexical Error at {line}:{col}: Unknown character '{text}'")
         
-        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column))
+        self.pos = len(source)
+        self.line, self.column = line_col(self.pos)
+        tokens.append(Token(TokenType.EOF, None, self.line, self.column))
         return self.tokens, self.errors
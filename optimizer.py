@@ -3,8 +3,60 @@ PHASE 5: CODE OPTIMIZER
 Basic optimizations: constant folding, algebraic simplification
 """
 
+import operator
 import re
 
+# Binary operators folded at compile time; / and % are never folded
+# with a zero divisor
+FOLD_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+}
+
+# Variable names referenced by an instruction (remove_dead_code)
+IDENTIFIER = re.compile(r'\b[a-zA-Z_]\w*\b')
+
+# TAC keywords that IDENTIFIER also matches
+TAC_KEYWORDS = frozenset({'IF_FALSE', 'GOTO', 'PRINT', 'READ', 'ALLOC', 'ENTER_SCOPE', 'EXIT_SCOPE',
+                          'PARAM', 'PUSH', 'CALL', 'RETURN', 'RETVAL'})
+
+# Kinds of TAC lines for dead-code elimination (see Optimizer.classify)
+LINE_KEEP = 0       # Labels, ALLOC, PARAM, CALL, END_MAIN, END_FUNC_*
+LINE_KEEP_USES = 1  # Control flow and I/O: kept, and their operands are uses
+LINE_ASSIGN = 2     # dest = expr, dropped if dest is an unused temporary
+LINE_DROP = 3       # Scope markers and anything unrecognized
+
+# Line kind of each TAC opcode, so classify needs one dict lookup
+OPCODE_KINDS = {
+    'IF_FALSE': LINE_KEEP_USES,
+    'GOTO': LINE_KEEP_USES,
+    'PRINT': LINE_KEEP_USES,
+    'READ': LINE_KEEP_USES,
+    'PUSH': LINE_KEEP_USES,
+    'RETURN': LINE_KEEP_USES,
+    'ALLOC': LINE_KEEP,
+    'PARAM': LINE_KEEP,
+    'CALL': LINE_KEEP,
+    'END_MAIN': LINE_KEEP,
+    'ENTER_SCOPE': LINE_DROP,
+    'EXIT_SCOPE': LINE_DROP,
+}
+
+# Uses of a line that reads no variables
+NO_USES = ()
+
+
+def parse_operand(token):
+    """Numeric literal token -> int or float; anything else stays a string"""
+    digits = token[1:] if token.startswith('-') else token
+    if digits[:1].isdigit() and digits.replace('.', '', 1).isdigit():
+        return float(token) if '.' in token else int(token)
+    return token
+
+
 class Optimizer:
     def __init__(self):
         self.optimized_code = []
@@ -12,155 +64,193 @@ class Optimizer:
     def optimize(self, tac_code):
         """Apply basic optimizations to TAC"""
         self.optimized_code = []
+        lines = [instruction.split() for instruction in tac_code]
         
-        for instruction in tac_code:
-            optimized = self.constant_folding(instruction)
-            optimized = self.algebraic_simplification(optimized)
-            self.optimized_code.append(optimized)
+        # Constant propagation: a temporary assigned once, to a number,
+        # has that value at every later use, so it is substituted there
+        # and the use may fold in turn (t0 = 2 + 3; t1 = t0 * 4 -> t1 = 20).
+        # ICG temporaries are always assigned before their uses, so one
+        # forward pass reaches the fixpoint.
+        def_counts = self.count_definitions(lines)
+        constants = {}
+        
+        for instruction, parts in zip(tac_code, lines):
+            if len(parts) < 3 or parts[1] != '=':
+                self.optimized_code.append(instruction)
+                continue
+            
+            # dest = left op right: substitute constants, then fold or
+            # simplify (arithmetic operators only). A line is rebuilt only
+            # when it changed; otherwise the original string is kept
+            result_var = parts[0]
+            value = None
+            if len(parts) == 5:
+                substituted = parts[2] in constants or parts[4] in constants
+                if substituted:
+                    parts[2] = constants.get(parts[2], parts[2])
+                    parts[4] = constants.get(parts[4], parts[4])
+                if parts[3] in FOLD_OPS:
+                    value = self.fold_or_simplify(parts)
+                if value is not None:
+                    instruction = f"{result_var} = {value}"
+                elif substituted and not (parts[2].startswith('-') or parts[4].startswith('-')):
+                    # A negative operand is only substituted if it folds
+                    # away: the code generator reads its "-" as subtraction
+                    instruction = ' '.join(parts)
+            
+            # Copy: dest = value
+            elif len(parts) == 3:
+                if parts[2] in constants:
+                    parts[2] = constants[parts[2]]
+                    instruction = ' '.join(parts)
+                value = parse_operand(parts[2])
+            
+            if (value is not None and def_counts.get(result_var) == 1
+                    and result_var[0] == 't' and result_var[1:].isdigit()):
+                text = str(value)
+                if not isinstance(parse_operand(text), str):
+                    constants[result_var] = text
+            self.optimized_code.append(instruction)
         
         # Remove dead code (unused temporaries)
         self.optimized_code = self.remove_dead_code(self.optimized_code)
         
         return self.optimized_code
     
-    def constant_folding(self, instruction):
+    def count_definitions(self, lines):
+        """
+        Number of assignments to each variable in the split TAC lines;
+        declared, PARAM and READ variables count as redefined so they
+        are never propagated
+        """
+        def_counts = {}
+        for parts in lines:
+            if len(parts) > 2 and parts[1] == '=':
+                def_counts[parts[0]] = def_counts.get(parts[0], 0) + 1
+            elif len(parts) > 1 and parts[0] in ('ALLOC', 'PARAM', 'READ'):
+                def_counts[parts[1]] = 2
+        return def_counts
+    
+    def fold_or_simplify(self, parts):
+        """
+        Value of the split instruction dest = left op right after constant
+        folding or an algebraic identity (a number or a variable name);
+        None if neither applies. Numeric literal operands are parsed once
+        here.
+        """
+        _, _, left, op, right = parts
+        left = parse_operand(left)
+        right = parse_operand(right)
+        if isinstance(right, str):
+            return None
+        
+        if isinstance(left, str):
+            return self.algebraic_simplification(left, op, right)
+        return self.constant_folding(left, op, right)
+    
+    def constant_folding(self, left, op, right):
         """Fold constant expressions at compile time"""
-        # Pattern: t0 = 3 + 5 -> t0 = 8
-        pattern = r'(\w+) = (-?\d+\.?\d*) ([+\-*/%]) (-?\d+\.?\d*)'
-        match = re.match(pattern, instruction)
-        
-        if match:
-            result_var = match.group(1)
-            left = match.group(2)
-            op = match.group(3)
-            right = match.group(4)
-            
-            try:
-                # Determine if float or int
-                if '.' in left or '.' in right:
-                    left_val = float(left)
-                    right_val = float(right)
-                else:
-                    left_val = int(left)
-                    right_val = int(right)
-                
-                # Compute result
-                if op == '+':
-                    result = left_val + right_val
-                elif op == '-':
-                    result = left_val - right_val
-                elif op == '*':
-                    result = left_val * right_val
-                elif op == '/':
-                    if right_val != 0:
-                        result = left_val / right_val
-                    else:
-                        return instruction  # Don't optimize division by zero
-                elif op == '%':
-                    if right_val != 0:
-                        result = left_val % right_val
-                    else:
-                        return instruction
-                else:
-                    return instruction
-                
-                return f"{result_var} = {result}"
-            except:
-                return instruction
-        
-        return instruction
+        # 3 + 5 -> 8; None if the expression must stay
+        # An int and a float operand are both folded as floats
+        if isinstance(left, float) or isinstance(right, float):
+            left, right = float(left), float(right)
+        
+        # Don't optimize division by zero
+        if right == 0 and (op == '/' or op == '%'):
+            return None
+        
+        try:
+            return FOLD_OPS[op](left, right)
+        except ArithmeticError:
+            return None  # e.g. an int too large for float division
     
-    def algebraic_simplification(self, instruction):
+    def algebraic_simplification(self, left, op, right):
         """Simplify algebraic expressions"""
-        # x * 1 -> x
-        pattern1 = r'(\w+) = (\w+) \* 1(?:\.\d+)?$'
-        match = re.match(pattern1, instruction)
-        if match:
-            return f"{match.group(1)} = {match.group(2)}"
-        
-        # x * 0 -> 0
-        pattern2 = r'(\w+) = (\w+) \* 0(?:\.\d+)?$'
-        match = re.match(pattern2, instruction)
-        if match:
-            return f"{match.group(1)} = 0"
-        
-        # x + 0 -> x
-        pattern3 = r'(\w+) = (\w+) \+ 0(?:\.\d+)?$'
-        match = re.match(pattern3, instruction)
-        if match:
-            return f"{match.group(1)} = {match.group(2)}"
-        
-        # x - 0 -> x
-        pattern4 = r'(\w+) = (\w+) - 0(?:\.\d+)?$'
-        match = re.match(pattern4, instruction)
-        if match:
-            return f"{match.group(1)} = {match.group(2)}"
-        
-        return instruction
+        # Only a variable with a numeric right operand; None if no
+        # identity applies
+        if not left.isidentifier():
+            return None
+        
+        # x * 1 -> x, x * 0 -> 0
+        if op == '*':
+            if right == 1:
+                return left
+            if right == 0:
+                return 0
+        
+        # x + 0 -> x, x - 0 -> x
+        elif (op == '+' or op == '-') and right == 0:
+            return left
+        
+        return None
     
-    def remove_dead_code(self, code):
-        """Remove unused temporary variables"""
-        used_vars = set()
-        
-        # First pass: collect all used variables
-        for instruction in code:
-            # Variables in control flow, PUSH, RETURN, PRINT, READ
-            if any(keyword in instruction for keyword in ['IF_FALSE', 'GOTO', 'PRINT', 'READ', 'PUSH', 'RETURN']):
-                tokens = re.findall(r'\b[a-zA-Z_]\w*\b', instruction)
-                # Filter out keywords
-                keywords = {'IF_FALSE', 'GOTO', 'PRINT', 'READ', 'ALLOC', 'ENTER_SCOPE', 'EXIT_SCOPE', 'PARAM', 'PUSH', 'CALL', 'RETURN', 'RETVAL'}
-                for token in tokens:
-                    if token not in keywords:
-                        used_vars.add(token)
+    def classify(self, instruction):
+        """
+        Record (kind, dest, uses) of a TAC line for remove_dead_code:
+        dest is the assigned variable of an assignment, uses the list of
+        names the line reads
+        """
+        if instruction.endswith(':'):
+            return (LINE_KEEP, None, NO_USES)
+        
+        tokens = IDENTIFIER.findall(instruction)
+        if not tokens:
+            return (LINE_DROP, None, NO_USES)
+        
+        opcode = tokens[0]
+        kind = OPCODE_KINDS.get(opcode)
+        if kind is None:
+            if opcode.startswith('END_FUNC'):
+                return (LINE_KEEP, None, NO_USES)
             
-            # Find variables on right side of assignments (but not the left side)
-            # Be careful with == operator
-            elif '=' in instruction and not instruction.endswith(':'):
-                # Check if it's an assignment (single =) not a comparison (==)
-                if '==' not in instruction and '!=' not in instruction and '<=' not in instruction and '>=' not in instruction:
-                    parts = instruction.split('=', 1)  # Split only on first =
-                    if len(parts) == 2:
-                        right_side = parts[1]
-                        # Extract variable names used on right side (not numbers)
-                        tokens = re.findall(r'\b[a-zA-Z_]\w*\b', right_side)
-                        used_vars.update(tokens)
-        
-        # Second pass: keep only instructions that define used variables or are control flow
-        optimized = []
-        for instruction in code:
-            # Keep labels and control flow
-            if instruction.endswith(':') or 'GOTO' in instruction or 'IF_FALSE' in instruction:
-                optimized.append(instruction)
+            # Assignment: every name on the right side is a use, comparisons included
+            if '=' in instruction:
+                return (LINE_ASSIGN, opcode, tokens[1:])
+            return (LINE_DROP, None, NO_USES)
+        
+        if kind == LINE_KEEP_USES:
+            return (LINE_KEEP_USES, None, [token for token in tokens if token not in TAC_KEYWORDS])
+        return (kind, None, NO_USES)
+    
+    def remove_dead_code(self, code):
+        """Remove temporaries whose values never reach a kept instruction"""
+        records = [self.classify(instruction) for instruction in code]
+        
+        # Def-use graph: every assigned variable gets an integer id, and
+        # def_lines[id] lists the lines that assign it
+        var_ids = {}
+        def_lines = []
+        for index, (kind, dest, _) in enumerate(records):
+            if kind == LINE_ASSIGN:
+                if dest not in var_ids:
+                    var_ids[dest] = len(def_lines)
+                    def_lines.append([])
+                def_lines[var_ids[dest]].append(index)
+        
+        # Live roots: variables read by kept lines and by assignments to
+        # non-temporaries (which are never removed)
+        worklist = []
+        for kind, dest, uses in records:
+            if kind == LINE_KEEP_USES or (kind == LINE_ASSIGN and not dest.startswith('t')):
+                worklist.extend(var_ids[name] for name in uses if name in var_ids)
+        
+        # A variable is live if a live line reads it; its assignments
+        # then make their operands live too
+        live = [False] * len(def_lines)
+        while worklist:
+            var_id = worklist.pop()
+            if live[var_id]:
                 continue
-            
-            # Keep PRINT, READ, ALLOC, function-related instructions
-            if any(keyword in instruction for keyword in ['PRINT', 'READ', 'ALLOC', 'PARAM', 'PUSH', 'CALL', 'RETURN', 'END_FUNC', 'END_MAIN']):
+            live[var_id] = True
+            for index in def_lines[var_id]:
+                worklist.extend(var_ids[name] for name in records[index][2] if name in var_ids)
+        
+        # Keep only instructions that are kept by kind or define a live
+        # variable (or a non-temporary one)
+        optimized = []
+        for instruction, (kind, dest, _) in zip(code, records):
+            if kind == LINE_KEEP or kind == LINE_KEEP_USES or (
+                    kind == LINE_ASSIGN and (not dest.startswith('t') or live[var_ids[dest]])):
                 optimized.append(instruction)
-                continue
-            
-            # Skip ENTER_SCOPE and EXIT_SCOPE - not needed in optimized code
-            if 'ENTER_SCOPE' in instruction or 'EXIT_SCOPE' in instruction:
-                continue
-            
-            # For assignments, check if left side is used
-            if '=' in instruction:
-                # Make sure it's an assignment, not just a label
-                if '==' not in instruction and '!=' not in instruction and '<=' not in instruction and '>=' not in instruction:
-                    parts = instruction.split('=', 1)
-                    if len(parts) == 2:
-                        left_var = parts[0].strip()
-                        # Keep if it's not a temporary OR if it's used somewhere
-                        if not left_var.startswith('t') or left_var in used_vars:
-                            optimized.append(instruction)
-                            continue
-                else:
-                    # It's a comparison operation (contains ==, !=, <=, >=)
-                    # These should always be kept if they define a variable
-                    parts = instruction.split('=', 1)
-                    if len(parts) == 2:
-                        left_var = parts[0].strip()
-                        if left_var in used_vars or not left_var.startswith('t'):
-                            optimized.append(instruction)
-                            continue
         
         return optimized
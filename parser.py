@@ -3,29 +3,100 @@ PHASE 2: SYNTAX ANALYZER (PARSER)
 Recursive Descent Parser - builds AST from tokens
 """
 
+import operator
+
 from lexer import TokenType
 from ast_nodes import *
 
+# Token types that end a statement list, and where error recovery stops
+STMT_LIST_END = frozenset({TokenType.EOF, TokenType.RBRACE})
+RECOVERY_STOP = frozenset({TokenType.SEMICOLON, TokenType.RBRACE, TokenType.EOF})
+
+# Variable and parameter types; functions may also return void
+VAR_TYPES = frozenset({TokenType.INT, TokenType.FLOAT, TokenType.CHAR})
+RETURN_TYPES = VAR_TYPES | {TokenType.VOID}
+
+# Binary precedence levels, loosest first (see parse_expr)
+PREC_OR = 1
+PREC_AND = 2
+PREC_RELATIONAL = 3  # Non-associative: a < b < c is not an expression
+PREC_ADDITIVE = 4
+PREC_MULTIPLICATIVE = 5
+
+# Binary operator token type -> precedence level
+BINARY_PRECEDENCE = {
+    TokenType.OR: PREC_OR,
+    TokenType.AND: PREC_AND,
+    TokenType.EQ: PREC_RELATIONAL,
+    TokenType.NEQ: PREC_RELATIONAL,
+    TokenType.LT: PREC_RELATIONAL,
+    TokenType.GT: PREC_RELATIONAL,
+    TokenType.LTE: PREC_RELATIONAL,
+    TokenType.GTE: PREC_RELATIONAL,
+    TokenType.PLUS: PREC_ADDITIVE,
+    TokenType.MINUS: PREC_ADDITIVE,
+    TokenType.MULTIPLY: PREC_MULTIPLICATIVE,
+    TokenType.DIVIDE: PREC_MULTIPLICATIVE,
+    TokenType.MODULO: PREC_MULTIPLICATIVE,
+}
+
+# Arithmetic folded when both operands are literals (see make_binary_op)
+FOLD_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+}
+
+# Literal token type -> Literal lit_type
+LITERAL_TYPES = {
+    TokenType.INTEGER_LITERAL: 'int',
+    TokenType.FLOAT_LITERAL: 'float',
+    TokenType.CHAR_LITERAL: 'char',
+}
+
 class Parser:
     def __init__(self, tokens):
         self.tokens = tokens
         self.pos = 0
         self.current_token = self.tokens[0] if tokens else None
+        self.next_token = self.tokens[1] if len(tokens) > 1 else None  # One-token lookahead
         self.errors = []
+        
+        # Statement parser for each token type that can start a statement
+        # (IDENTIFIER is handled in parse_stmt: assignment or call)
+        self.stmt_handlers = {
+            TokenType.INT: self.parse_decl_stmt,
+            TokenType.FLOAT: self.parse_decl_stmt,
+            TokenType.CHAR: self.parse_decl_stmt,
+            TokenType.IF: self.parse_if_stmt,
+            TokenType.LOOP: self.parse_loop_stmt,
+            TokenType.SHOW: self.parse_print_stmt,
+            TokenType.TELL: self.parse_input_stmt,
+            TokenType.RETURN: self.parse_return_stmt,
+            TokenType.LBRACE: self.parse_block,
+        }
     
     def advance(self):
         if self.pos < len(self.tokens) - 1:
             self.pos += 1
             self.current_token = self.tokens[self.pos]
+            self.next_token = self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
     
-    def peek(self, offset=1):
-        pos = self.pos + offset
-        if pos < len(self.tokens):
-            return self.tokens[pos]
-        return None
+    def skip_until(self, stop_types):
+        """Move to the next token whose type is in stop_types (or the last token)"""
+        tokens = self.tokens
+        pos = self.pos
+        last = len(tokens) - 1
+        while pos < last and tokens[pos].type not in stop_types:
+            pos += 1
+        self.pos = pos
+        self.current_token = tokens[pos]
+        self.next_token = tokens[pos + 1] if pos < last else None
     
     def expect(self, token_type):
-        if self.current_token.type == token_type:
+        if self.current_token.type is token_type:
             token = self.current_token
             self.advance()
             return token
@@ -40,7 +111,7 @@ class Parser:
     def parse(self):
         # Parse function declarations first
         functions = []
-        while self.current_token.type == TokenType.FUNC:
+        while self.current_token.type is TokenType.FUNC:
             func = self.parse_function_decl()
             if func:
                 functions.append(func)
@@ -48,33 +119,33 @@ class Parser:
         # Parse main program statements
         statements = self.parse_stmt_list()
         
-        if self.current_token.type != TokenType.EOF:
+        if self.current_token.type is not TokenType.EOF:
             self.error("Unexpected tokens after program end")
         
         return Program(functions, statements)
     
     def parse_stmt_list(self):
         statements = []
-        while self.current_token.type not in [TokenType.EOF, TokenType.RBRACE]:
+        while self.current_token.type not in STMT_LIST_END:
             stmt = self.parse_stmt()
             if stmt:
                 statements.append(stmt)
             else:
                 # Error recovery: skip to next semicolon or brace
-                while self.current_token.type not in [TokenType.SEMICOLON, TokenType.RBRACE, TokenType.EOF]:
-                    self.advance()
-                if self.current_token.type == TokenType.SEMICOLON:
+                self.skip_until(RECOVERY_STOP)
+                if self.current_token.type is TokenType.SEMICOLON:
                     self.advance()
         return statements
     
     def parse_stmt(self):
         token_type = self.current_token.type
         
-        if token_type in [TokenType.INT, TokenType.FLOAT, TokenType.CHAR]:
-            return self.parse_decl_stmt()
-        elif token_type == TokenType.IDENTIFIER:
+        handler = self.stmt_handlers.get(token_type)
+        if handler is not None:
+            return handler()
+        elif token_type is TokenType.IDENTIFIER:
             # Could be assignment or function call statement
-            if self.peek() and self.peek().type == TokenType.LPAREN:
+            if self.next_token is not None and self.next_token.type is TokenType.LPAREN:
                 # Function call as statement
                 line = self.current_token.line
                 func_call = self.parse_function_call()
@@ -82,18 +153,6 @@ class Parser:
                 return func_call
             else:
                 return self.parse_assign_stmt()
-        elif token_type == TokenType.IF:
-            return self.parse_if_stmt()
-        elif token_type == TokenType.LOOP:
-            return self.parse_loop_stmt()
-        elif token_type == TokenType.SHOW:
-            return self.parse_print_stmt()
-        elif token_type == TokenType.TELL:
-            return self.parse_input_stmt()
-        elif token_type == TokenType.RETURN:
-            return self.parse_return_stmt()
-        elif token_type == TokenType.LBRACE:
-            return self.parse_block()
         else:
             self.error(f"Unexpected token {token_type.name}")
             return None
@@ -103,12 +162,13 @@ class Parser:
         var_type = self.current_token.value
         self.advance()
         
-        if not self.expect(TokenType.IDENTIFIER):
+        name_token = self.expect(TokenType.IDENTIFIER)
+        if name_token is None:
             return None
-        identifier = self.tokens[self.pos - 1].value
+        identifier = name_token.value
         
         init_value = None
-        if self.current_token.type == TokenType.ASSIGN:
+        if self.current_token.type is TokenType.ASSIGN:
             self.advance()
             init_value = self.parse_expr()
         
@@ -140,7 +200,7 @@ class Parser:
         if_block = self.parse_block()
         
         elif_parts = []
-        while self.current_token.type == TokenType.ELIF:
+        while self.current_token.type is TokenType.ELIF:
             self.advance()
             if not self.expect(TokenType.LPAREN):
                 break
@@ -151,7 +211,7 @@ class Parser:
             elif_parts.append((elif_cond, elif_block))
         
         else_block = None
-        if self.current_token.type == TokenType.ELSE:
+        if self.current_token.type is TokenType.ELSE:
             self.advance()
             else_block = self.parse_block()
         
@@ -167,7 +227,7 @@ class Parser:
         expressions = []
         expressions.append(self.parse_expr())
         
-        while self.current_token.type == TokenType.COMMA:
+        while self.current_token.type is TokenType.COMMA:
             self.advance()  # consume ','
             expressions.append(self.parse_expr())
         
@@ -178,9 +238,10 @@ class Parser:
         line = self.current_token.line
         self.advance()  # consume 'tell'
         
-        if not self.expect(TokenType.IDENTIFIER):
+        name_token = self.expect(TokenType.IDENTIFIER)
+        if name_token is None:
             return None
-        identifier = self.tokens[self.pos - 1].value
+        identifier = name_token.value
         
         self.expect(TokenType.SEMICOLON)
         return InputStmt(identifier, line)
@@ -197,119 +258,97 @@ class Parser:
         return Block(statements)
     
     def parse_condition(self):
-        return self.parse_logical_or()
-    
-    def parse_logical_or(self):
-        left = self.parse_logical_and()
-        
-        while self.current_token.type == TokenType.OR:
-            op = self.current_token.value
-            line = self.current_token.line
-            self.advance()
-            right = self.parse_logical_and()
-            left = BinaryOp(left, op, right, line)
-        
-        return left
+        return self.parse_expr(PREC_OR)
     
-    def parse_logical_and(self):
-        left = self.parse_relational()
-        
-        while self.current_token.type == TokenType.AND:
-            op = self.current_token.value
-            line = self.current_token.line
-            self.advance()
-            right = self.parse_relational()
-            left = BinaryOp(left, op, right, line)
+    def parse_expr(self, min_prec=PREC_ADDITIVE):
+        """
+        Precedence climbing over BINARY_PRECEDENCE: parse operators of
+        precedence min_prec or tighter. Plain expressions are
+        arithmetic only (PREC_ADDITIVE); conditions start at PREC_OR.
+        
+        At relational level and looser, '!' applies to a whole
+        relation and '(' opens a nested condition; after either only
+        && and || may follow.
+        """
+        token = self.current_token
+        limit = PREC_MULTIPLICATIVE  # Tightest operator allowed next
         
-        return left
-    
-    def parse_relational(self):
-        if self.current_token.type == TokenType.NOT:
-            op = self.current_token.value
-            line = self.current_token.line
+        if min_prec <= PREC_RELATIONAL and token.type is TokenType.NOT:
             self.advance()
-            operand = self.parse_relational()
-            return UnaryOp(op, operand, line)
-        
-        if self.current_token.type == TokenType.LPAREN:
+            operand = self.parse_expr(PREC_RELATIONAL)
+            left = UnaryOp(token.value, operand, token.line)
+            limit = PREC_AND
+        elif min_prec <= PREC_RELATIONAL and token.type is TokenType.LPAREN:
             self.advance()
-            cond = self.parse_condition()
+            left = self.parse_condition()
             self.expect(TokenType.RPAREN)
-            return cond
-        
-        left = self.parse_expr()
-        
-        if self.current_token.type in [TokenType.EQ, TokenType.NEQ, TokenType.LT, 
-                                        TokenType.GT, TokenType.LTE, TokenType.GTE]:
-            op = self.current_token.value
-            line = self.current_token.line
-            self.advance()
-            right = self.parse_expr()
-            return BinaryOp(left, op, right, line)
-        
-        return left
-    
-    def parse_expr(self):
-        return self.parse_additive()
-    
-    def parse_additive(self):
-        left = self.parse_multiplicative()
+            limit = PREC_AND
+        else:
+            left = self.parse_unary()
         
-        while self.current_token.type in [TokenType.PLUS, TokenType.MINUS]:
-            op = self.current_token.value
-            line = self.current_token.line
+        while True:
+            token = self.current_token
+            prec = BINARY_PRECEDENCE.get(token.type, 0)
+            if prec < min_prec or prec > limit:
+                return left
+            
             self.advance()
-            right = self.parse_multiplicative()
-            left = BinaryOp(left, op, right, line)
-        
-        return left
+            right = self.parse_expr(prec + 1)
+            
+            if prec >= PREC_ADDITIVE:
+                left = self.make_binary_op(left, token.value, right, token.line)
+            else:
+                left = BinaryOp(left, token.value, right, token.line)
+            
+            # Left-associative: right took every tighter operator, so
+            # only this level (relational: none) or looser may follow
+            limit = prec - 1 if prec == PREC_RELATIONAL else prec
     
-    def parse_multiplicative(self):
-        left = self.parse_unary()
-        
-        while self.current_token.type in [TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO]:
-            op = self.current_token.value
-            line = self.current_token.line
-            self.advance()
-            right = self.parse_unary()
-            left = BinaryOp(left, op, right, line)
-        
-        return left
+    def make_binary_op(self, left, op, right, line):
+        """
+        Build an arithmetic BinaryOp, folding it at construction: two int
+        or two float literals become one Literal. Identities such as x + 0
+        are left to the TAC optimizer, since the parser doesn't know x's
+        type and x + 0 promotes a char to int
+        """
+        if (isinstance(left, Literal) and isinstance(right, Literal)
+                and left.lit_type == right.lit_type and left.lit_type in ('int', 'float')):
+            # int / int is left to run time; never fold a zero divisor
+            if not (op == '/' and left.lit_type == 'int') and not (op in ('/', '%') and right.value == 0):
+                value = FOLD_OPERATORS[op](left.value, right.value)
+                # TAC operands can't be negative literals, so neither can a fold
+                if value >= 0:
+                    return Literal(value, left.lit_type, line)
+        
+        return BinaryOp(left, op, right, line)
     
     def parse_unary(self):
-        if self.current_token.type == TokenType.MINUS:
-            op = self.current_token.value
-            line = self.current_token.line
+        token = self.current_token
+        if token.type is TokenType.MINUS:
             self.advance()
             operand = self.parse_unary()
-            return UnaryOp(op, operand, line)
+            return UnaryOp(token.value, operand, token.line)
         
         return self.parse_primary()
     
     def parse_primary(self):
         token = self.current_token
         
-        if token.type == TokenType.IDENTIFIER:
+        if token.type is TokenType.IDENTIFIER:
             # Check if it's a function call
-            if self.peek() and self.peek().type == TokenType.LPAREN:
+            if self.next_token is not None and self.next_token.type is TokenType.LPAREN:
                 return self.parse_function_call()
             else:
                 self.advance()
                 return Identifier(token.value, token.line)
         
-        elif token.type == TokenType.INTEGER_LITERAL:
-            self.advance()
-            return Literal(token.value, 'int', token.line)
-        
-        elif token.type == TokenType.FLOAT_LITERAL:
-            self.advance()
-            return Literal(token.value, 'float', token.line)
-        
-        elif token.type == TokenType.CHAR_LITERAL:
+        elif token.type in LITERAL_TYPES:
+            # The lexer has already converted the value (int, float or
+            # a one-character string), so it is stored as is
             self.advance()
-            return Literal(token.value, 'char', token.line)
+            return Literal(token.value, LITERAL_TYPES[token.type], token.line)
         
-        elif token.type == TokenType.LPAREN:
+        elif token.type is TokenType.LPAREN:
             self.advance()
             expr = self.parse_expr()
             self.expect(TokenType.RPAREN)
@@ -325,16 +364,17 @@ class Parser:
         self.advance()  # consume 'func'
         
         # Return type
-        if self.current_token.type not in [TokenType.INT, TokenType.FLOAT, TokenType.CHAR, TokenType.VOID]:
+        if self.current_token.type not in RETURN_TYPES:
             self.error("Expected return type (int, float, char, or void)")
             return None
         return_type = self.current_token.value
         self.advance()
         
         # Function name
-        if not self.expect(TokenType.IDENTIFIER):
+        name_token = self.expect(TokenType.IDENTIFIER)
+        if name_token is None:
             return None
-        func_name = self.tokens[self.pos - 1].value
+        func_name = name_token.value
         
         # Parameters
         if not self.expect(TokenType.LPAREN):
@@ -354,12 +394,12 @@ class Parser:
         """Parse function parameter list"""
         parameters = []
         
-        if self.current_token.type in [TokenType.INT, TokenType.FLOAT, TokenType.CHAR]:
+        if self.current_token.type in VAR_TYPES:
             param = self.parse_param()
             if param:
                 parameters.append(param)
             
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_token.type is TokenType.COMMA:
                 self.advance()
                 param = self.parse_param()
                 if param:
@@ -369,16 +409,17 @@ class Parser:
     
     def parse_param(self):
         """Parse a single parameter"""
-        if self.current_token.type not in [TokenType.INT, TokenType.FLOAT, TokenType.CHAR]:
+        if self.current_token.type not in VAR_TYPES:
             self.error("Expected parameter type")
             return None
         
         param_type = self.current_token.value
         self.advance()
         
-        if not self.expect(TokenType.IDENTIFIER):
+        name_token = self.expect(TokenType.IDENTIFIER)
+        if name_token is None:
             return None
-        param_name = self.tokens[self.pos - 1].value
+        param_name = name_token.value
         
         return (param_type, param_name)
     
@@ -402,12 +443,12 @@ class Parser:
         """Parse function call arguments"""
         arguments = []
         
-        if self.current_token.type != TokenType.RPAREN:
+        if self.current_token.type is not TokenType.RPAREN:
             arg = self.parse_expr()
             if arg:
                 arguments.append(arg)
             
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_token.type is TokenType.COMMA:
                 self.advance()
                 arg = self.parse_expr()
                 if arg:
@@ -421,7 +462,7 @@ class Parser:
         self.advance()  # consume 'return'
         
         expression = None
-        if self.current_token.type != TokenType.SEMICOLON:
+        if self.current_token.type is not TokenType.SEMICOLON:
             expression = self.parse_expr()
         
         self.expect(TokenType.SEMICOLON)
@@ -433,7 +474,7 @@ class Parser:
         self.advance()  # consume 'loop'
         
         # Check if it's a conditional loop: loop (condition) {}
-        if self.current_token.type == TokenType.LPAREN:
+        if self.current_token.type is TokenType.LPAREN:
             self.advance()  # consume '('
             condition = self.parse_condition()
             if not self.expect(TokenType.RPAREN):
@@ -448,19 +489,20 @@ class Parser:
             return None
         
         # Variable name
-        if not self.expect(TokenType.IDENTIFIER):
+        name_token = self.expect(TokenType.IDENTIFIER)
+        if name_token is None:
             return None
-        var_name = self.tokens[self.pos - 1].value
+        var_name = name_token.value
         
         # Check if next token is '=' or 'to'
         use_existing_var = False
         start_expr = None
         
-        if self.current_token.type == TokenType.ASSIGN:
+        if self.current_token.type is TokenType.ASSIGN:
             # New syntax: loop from i = 0 to 10
             self.advance()  # consume '='
             start_expr = self.parse_expr()
-        elif self.current_token.type == TokenType.TO:
+        elif self.current_token.type is TokenType.TO:
             # New syntax: loop from i to 10 (uses existing variable)
             use_existing_var = True
         else:
@@ -476,7 +518,7 @@ class Parser:
         
         # Optional 'step'
         step_expr = None
-        if self.current_token.type == TokenType.STEP:
+        if self.current_token.type is TokenType.STEP:
             self.advance()
             step_expr = self.parse_expr()
         
@@ -6,45 +6,64 @@ Type checking, scope management, declaration-before-use validation
 from ast_nodes import *
 from symbol_table import SymbolTable
 
+# Types allowed in arithmetic, negation and loop bounds
+NUMERIC_TYPES = frozenset({'int', 'float'})
+
+# Types that compare with each other (char compares as a number)
+COMPARABLE_TYPES = frozenset({'int', 'float', 'char'})
+
+# Binary operators by the result they produce
+LOGICAL_OPERATORS = frozenset({'&&', '||'})
+RELATIONAL_OPERATORS = frozenset({'==', '!=', '<', '>', '<=', '>='})
+ARITHMETIC_OPERATORS = frozenset({'+', '-', '*', '/', '%'})
+
+# (target, source) pairs assignable without a cast besides equal types
+IMPLICIT_CONVERSIONS = frozenset({
+    ('float', 'int'),  # Widening
+    ('int', 'char'),
+})
+
+# Result type of arithmetic on (left, right): char is promoted to int,
+# and float with anything numeric is float
+ARITHMETIC_RESULT_TYPES = {
+    ('int', 'int'): 'int',
+    ('int', 'char'): 'int',
+    ('char', 'int'): 'int',
+    ('char', 'char'): 'int',
+    ('int', 'float'): 'float',
+    ('float', 'int'): 'float',
+    ('float', 'float'): 'float',
+    ('char', 'float'): 'float',
+    ('float', 'char'): 'float',
+}
+
 class SemanticAnalyzer:
     def __init__(self):
         self.symbol_table = SymbolTable()
         self.errors = []
+        
+        # Symbol table operations used at every scope boundary and name
+        self.enter_scope = self.symbol_table.enter_scope
+        self.exit_scope = self.symbol_table.exit_scope
+        self.lookup = self.symbol_table.lookup
+        
+        # Visitor method for each AST node class, looked up once
+        self.visitors = {
+            node_class: getattr(self, f'visit_{node_class.__name__}')
+            for node_class in ASTNode.__subclasses__()
+            if hasattr(self, f'visit_{node_class.__name__}')
+        }
     
     def error(self, message, line=0):
+        """Record an error; called only on error paths, and every message is printed"""
         self.errors.append(f"Semantic Error at line {line}: {message}")
     
-    def has_return_statement(self, node):
-        """Check if a block or statement contains a return statement"""
-        if isinstance(node, ReturnStmt):
-            return True
-        elif isinstance(node, Block):
-            for stmt in node.statements:
-                if self.has_return_statement(stmt):
-                    return True
-        elif isinstance(node, IfStmt):
-            # Check if all branches have return
-            if self.has_return_statement(node.if_block):
-                return True
-            for _, elif_block in node.elif_parts:
-                if self.has_return_statement(elif_block):
-                    return True
-            if node.else_block and self.has_return_statement(node.else_block):
-                return True
-        elif isinstance(node, LoopStmt) or isinstance(node, ConditionalLoopStmt):
-            # Loops might have return statements
-            if hasattr(node, 'block') and self.has_return_statement(node.block):
-                return True
-        return False
-    
     def analyze(self, ast):
         self.visit(ast)
         return self.symbol_table, self.errors
     
     def visit(self, node):
-        method_name = f'visit_{node.__class__.__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        return self.visitors.get(type(node), self.generic_visit)(node)
     
     def generic_visit(self, node):
         raise Exception(f'No visit_{node.__class__.__name__} method')
@@ -65,7 +84,8 @@ class SemanticAnalyzer:
             if not success:
                 self.error(result, func.line)
         
-        # Second pass: analyze function bodies
+        # Second pass: analyze function bodies (only after every header
+        # is registered, so a body may call a function declared later)
         for func in node.functions:
             self.visit(func)
         
@@ -97,7 +117,7 @@ class SemanticAnalyzer:
     
     def visit_AssignStmt(self, node):
         # Check if variable is declared
-        entry = self.symbol_table.lookup(node.identifier)
+        entry = self.lookup(node.identifier)
         if not entry:
             self.error(f"Variable '{node.identifier}' not declared", node.line)
             return
@@ -110,44 +130,49 @@ class SemanticAnalyzer:
                 node.line
             )
         
-        # Mark as initialized
-        self.symbol_table.update_initialized(node.identifier)
+        # Mark as initialized (the entry resolved above)
+        entry.initialized = True
     
     def visit_IfStmt(self, node):
         # Check condition
         self.visit(node.condition)
         
         # Visit if block
-        self.symbol_table.enter_scope()
-        self.visit(node.if_block)
-        self.symbol_table.exit_scope()
+        self.enter_scope()
+        has_return = self.visit(node.if_block)
+        self.exit_scope()
         
         # Visit elif parts
         for elif_cond, elif_block in node.elif_parts:
             self.visit(elif_cond)
-            self.symbol_table.enter_scope()
-            self.visit(elif_block)
-            self.symbol_table.exit_scope()
+            self.enter_scope()
+            if self.visit(elif_block):
+                has_return = True
+            self.exit_scope()
         
         # Visit else block
         if node.else_block:
-            self.symbol_table.enter_scope()
-            self.visit(node.else_block)
-            self.symbol_table.exit_scope()
+            self.enter_scope()
+            if self.visit(node.else_block):
+                has_return = True
+            self.exit_scope()
+        
+        # Any branch with a return counts
+        return has_return
     
     def visit_LoopStmt(self, node):
         """Analyze loop from ... to ... step ... statement"""
-        self.symbol_table.enter_scope()
+        self.enter_scope()
         
         # Check if using existing variable or creating new one
         if node.use_existing_var:
             # Variable must already exist AND be initialized
-            entry = self.symbol_table.lookup(node.var_name)
+            entry = self.lookup(node.var_name)
             if not entry:
                 self.error(f"Loop variable '{node.var_name}' not declared", node.line)
             else:
                 # Check if it's numeric type
-                if entry.var_type not in ['int', 'float']:
+                if entry.var_type not in NUMERIC_TYPES:
                     self.error(f"Loop variable must be numeric, got {entry.var_type}", node.line)
                 # Check if variable is initialized
                 if not entry.initialized:
@@ -155,7 +180,7 @@ class SemanticAnalyzer:
                 # Variable is already initialized, no need to mark again
         else:
             # Check if loop variable exists or create it
-            entry = self.symbol_table.lookup(node.var_name)
+            entry = self.lookup(node.var_name)
             if not entry:
                 # Auto-declare loop variable as int
                 success, result = self.symbol_table.insert(
@@ -166,40 +191,47 @@ class SemanticAnalyzer:
                 )
                 if not success:
                     self.error(result, node.line)
+                else:
+                    entry = result
             
             # Check start expression type
             if node.start_expr:
                 start_type = self.visit(node.start_expr)
-                if start_type not in ['int', 'float']:
+                if start_type not in NUMERIC_TYPES:
                     self.error(f"Loop start must be numeric, got {start_type}", node.line)
         
+        # The loop variable's entry, as resolved for the loop header
+        node.resolved_entry = entry
+        
         # Check end expression type
         end_type = self.visit(node.end_expr)
-        if end_type not in ['int', 'float']:
+        if end_type not in NUMERIC_TYPES:
             self.error(f"Loop end must be numeric, got {end_type}", node.line)
         
         # Check step expression type (if provided)
         if node.step_expr:
             step_type = self.visit(node.step_expr)
-            if step_type not in ['int', 'float']:
+            if step_type not in NUMERIC_TYPES:
                 self.error(f"Loop step must be numeric, got {step_type}", node.line)
         
         # Visit loop body
-        self.visit(node.block)
+        has_return = self.visit(node.block)
         
-        self.symbol_table.exit_scope()
+        self.exit_scope()
+        return has_return
     
     def visit_ConditionalLoopStmt(self, node):
         """Analyze conditional loop (while-style)"""
-        self.symbol_table.enter_scope()
+        self.enter_scope()
         
         # Check condition
         self.visit(node.condition)
         
         # Visit loop body
-        self.visit(node.block)
+        has_return = self.visit(node.block)
         
-        self.symbol_table.exit_scope()
+        self.exit_scope()
+        return has_return
     
     def visit_PrintStmt(self, node):
         # Visit all expressions in the print statement
@@ -207,31 +239,49 @@ class SemanticAnalyzer:
             self.visit(expr)
     
     def visit_InputStmt(self, node):
-        entry = self.symbol_table.lookup(node.identifier)
+        entry = self.lookup(node.identifier)
         if not entry:
             self.error(f"Variable '{node.identifier}' not declared", node.line)
         else:
-            self.symbol_table.update_initialized(node.identifier)
+            entry.initialized = True
     
     def visit_Block(self, node):
-        # Enter new scope for block
-        self.symbol_table.enter_scope()
+        # Statement visits return True when the statement contains a
+        # return (see visit_ReturnStmt); a call statement returns its
+        # type, which does not count
+        has_return = False
+        scoped = False
+        visitors = self.visitors
         for stmt in node.statements:
-            self.visit(stmt)
+            stmt_type = type(stmt)
+            # Enter the block's scope at its first declaration: only a
+            # DeclStmt inserts at this level (nested statements open
+            # their own scopes), so blocks without one need no scope
+            if stmt_type is DeclStmt and not scoped:
+                self.enter_scope()
+                scoped = True
+            # Same as self.visit(stmt), without the extra call frame
+            if visitors.get(stmt_type, self.generic_visit)(stmt) is True:
+                has_return = True
         # Exit block scope
-        self.symbol_table.exit_scope()
+        if scoped:
+            self.exit_scope()
+        return has_return
     
     def visit_BinaryOp(self, node):
-        left_type = self.visit(node.left)
-        right_type = self.visit(node.right)
+        # Operands dispatched as in visit_Block
+        visitors = self.visitors
+        left, right = node.left, node.right
+        left_type = visitors.get(type(left), self.generic_visit)(left)
+        right_type = visitors.get(type(right), self.generic_visit)(right)
         
         # Logical operators
-        if node.operator in ['&&', '||']:
+        if node.operator in LOGICAL_OPERATORS:
             node.result_type = 'bool'
             return 'bool'
         
         # Relational operators
-        if node.operator in ['==', '!=', '<', '>', '<=', '>=']:
+        if node.operator in RELATIONAL_OPERATORS:
             if not self.are_types_comparable(left_type, right_type):
                 self.error(
                     f"Cannot compare {left_type} and {right_type}",
@@ -241,7 +291,7 @@ class SemanticAnalyzer:
             return 'bool'
         
         # Arithmetic operators
-        if node.operator in ['+', '-', '*', '/', '%']:
+        if node.operator in ARITHMETIC_OPERATORS:
             result_type = self.get_arithmetic_result_type(left_type, right_type)
             if result_type is None:
                 self.error(
@@ -258,7 +308,7 @@ class SemanticAnalyzer:
         operand_type = self.visit(node.operand)
         
         if node.operator == '-':
-            if operand_type not in ['int', 'float']:
+            if operand_type not in NUMERIC_TYPES:
                 self.error(f"Cannot negate {operand_type}", node.line)
             node.result_type = operand_type
             return operand_type
@@ -270,7 +320,7 @@ class SemanticAnalyzer:
         return operand_type
     
     def visit_Identifier(self, node):
-        entry = self.symbol_table.lookup(node.name)
+        entry = self.lookup(node.name)
         if not entry:
             self.error(f"Variable '{node.name}' not declared", node.line)
             return 'int'  # Default fallback
@@ -278,6 +328,7 @@ class SemanticAnalyzer:
         if not entry.initialized:
             self.error(f"Variable '{node.name}' used before initialization", node.line)
         
+        node.resolved_entry = entry
         node.var_type = entry.var_type
         return entry.var_type
     
@@ -287,12 +338,14 @@ class SemanticAnalyzer:
     def visit_FunctionDecl(self, node):
         """Analyze function declaration"""
         # Enter new scope for function
-        self.symbol_table.enter_scope()
+        self.enter_scope()
         self.symbol_table.current_function = node.name
         
-        # Add parameters to function scope
+        # Add parameters to function scope, one insert each so a repeated
+        # name is reported like any duplicate declaration
+        insert = self.symbol_table.insert
         for param_type, param_name in node.parameters:
-            success, result = self.symbol_table.insert(
+            success, result = insert(
                 param_name,
                 param_type,
                 node.line,
@@ -302,11 +355,11 @@ class SemanticAnalyzer:
                 self.error(result, node.line)
         
         # Analyze function body
-        self.visit(node.body)
+        has_return = self.visit(node.body)
         
         # Check if non-void function has return statement
         if node.return_type != 'void':
-            if not self.has_return_statement(node.body):
+            if not has_return:
                 self.error(
                     f"Function '{node.name}' with return type '{node.return_type}' must have a return statement",
                     node.line
@@ -314,12 +367,12 @@ class SemanticAnalyzer:
         
         # Exit function scope
         self.symbol_table.current_function = None
-        self.symbol_table.exit_scope()
+        self.exit_scope()
     
     def visit_FunctionCall(self, node):
         """Analyze function call"""
         # Check if function is declared
-        entry = self.symbol_table.lookup(node.name)
+        entry = self.lookup(node.name)
         if not entry:
             self.error(f"Function '{node.name}' not declared", node.line)
             return 'int'  # Default fallback
@@ -328,18 +381,22 @@ class SemanticAnalyzer:
             self.error(f"'{node.name}' is not a function", node.line)
             return 'int'
         
+        # Later passes read the function's signature from the node
+        node.resolved_entry = entry
+        param_types = entry.param_types
+        
         # Check argument count
-        if len(node.arguments) != len(entry.param_types):
+        if len(node.arguments) != len(param_types):
             self.error(
-                f"Function '{node.name}' expects {len(entry.param_types)} arguments, got {len(node.arguments)}",
+                f"Function '{node.name}' expects {len(param_types)} arguments, got {len(node.arguments)}",
                 node.line
             )
         
         # Check argument types
         for i, arg in enumerate(node.arguments):
             arg_type = self.visit(arg)
-            if i < len(entry.param_types):
-                expected_type = entry.param_types[i]
+            if i < len(param_types):
+                expected_type = param_types[i]
                 if not self.is_type_compatible(expected_type, arg_type):
                     self.error(
                         f"Argument {i+1} type mismatch: expected {expected_type}, got {arg_type}",
@@ -351,15 +408,15 @@ class SemanticAnalyzer:
         return entry.return_type
     
     def visit_ReturnStmt(self, node):
-        """Analyze return statement"""
+        """Analyze return statement; returns True for the enclosing function's return check"""
         if self.symbol_table.current_function is None:
             self.error("Return statement outside of function", node.line)
-            return
+            return True
         
         # Get function entry
-        func_entry = self.symbol_table.lookup(self.symbol_table.current_function)
+        func_entry = self.lookup(self.symbol_table.current_function)
         if not func_entry:
-            return
+            return True
         
         # Check return type
         if node.expression:
@@ -382,48 +439,20 @@ class SemanticAnalyzer:
                     f"Function '{func_entry.name}' must return a value of type {func_entry.return_type}",
                     node.line
                 )
+        
+        return True
     
     def is_type_compatible(self, target_type, source_type):
         """Check if source_type can be assigned to target_type"""
-        if target_type == source_type:
-            return True
-        
-        # Widening: int -> float is OK
-        if target_type == 'float' and source_type == 'int':
-            return True
-        
-        # char -> int is OK
-        if target_type == 'int' and source_type == 'char':
-            return True
-        
-        # Narrowing: float -> int is NOT OK
-        if target_type == 'int' and source_type == 'float':
-            return False
-        
-        return False
+        # Same type, or a widening listed in IMPLICIT_CONVERSIONS
+        # (narrowing float -> int is NOT OK)
+        return target_type == source_type or (target_type, source_type) in IMPLICIT_CONVERSIONS
     
     def are_types_comparable(self, type1, type2):
         """Check if two types can be compared"""
-        numeric_types = {'int', 'float', 'char'}
-        if type1 in numeric_types and type2 in numeric_types:
-            return True
-        return type1 == type2
+        # Same type first (the common case), then numeric cross-type
+        return type1 == type2 or (type1 in COMPARABLE_TYPES and type2 in COMPARABLE_TYPES)
     
     def get_arithmetic_result_type(self, type1, type2):
-        """Determine result type of arithmetic operation"""
-        # char promoted to int
-        if type1 == 'char':
-            type1 = 'int'
-        if type2 == 'char':
-            type2 = 'int'
-        
-        # float + anything numeric = float
-        if type1 == 'float' or type2 == 'float':
-            if type1 in ['int', 'float'] and type2 in ['int', 'float']:
-                return 'float'
-        
-        # int + int = int
-        if type1 == 'int' and type2 == 'int':
-            return 'int'
-        
-        return None
+        """Determine result type of arithmetic operation (None if invalid)"""
+        return ARITHMETIC_RESULT_TYPES.get((type1, type2))
@@ -3,7 +3,15 @@ SYMBOL TABLE MANAGER
 Manages variable declarations and scopes
 """
 
+from sys import intern
+
+# Shared param_types of every entry without parameters (immutable)
+NO_PARAMS = ()
+
 class SymbolEntry:
+    __slots__ = ('name', 'var_type', 'scope_level', 'line', 'initialized', 'offset',
+                 'is_function', 'param_types', 'return_type')
+    
     def __init__(self, name, var_type, scope_level, line, initialized=False, offset=0, is_function=False, param_types=None, return_type=None):
         self.name = name
         self.var_type = var_type
@@ -12,7 +20,7 @@ class SymbolEntry:
         self.initialized = initialized
         self.offset = offset
         self.is_function = is_function
-        self.param_types = param_types or []  # List of parameter types
+        self.param_types = param_types or NO_PARAMS  # Sequence of parameter types
         self.return_type = return_type  # For functions
     
     def __repr__(self):
@@ -23,24 +31,35 @@ class SymbolEntry:
 
 class SymbolTable:
     def __init__(self):
-        self.scopes = [{}]  # Stack of scopes (list of dictionaries)
+        self.scopes = [{}]  # Scope dicts by level; levels above current_scope are empty spares
+        self.symbols = {}  # Name -> entries visible under that name, innermost last
         self.current_scope = 0
         self.offset_counter = 0
         self.current_function = None  # Track current function for return type checking
     
     def enter_scope(self):
-        """Push a new scope onto the stack"""
-        self.scopes.append({})
+        """Push a new scope onto the stack, reusing a spare dict if one is left"""
         self.current_scope += 1
+        if self.current_scope == len(self.scopes):
+            self.scopes.append({})
     
     def exit_scope(self):
-        """Pop the current scope from the stack"""
+        """Pop the current scope from the stack (its dict is cleared and kept)"""
         if self.current_scope > 0:
-            self.scopes.pop()
+            scope = self.scopes[self.current_scope]
+            for name in scope:
+                entries = self.symbols[name]
+                entries.pop()
+                if not entries:
+                    del self.symbols[name]
+            scope.clear()
             self.current_scope -= 1
     
     def insert(self, name, var_type, line, initialized=False, is_function=False, param_types=None, return_type=None):
         """Insert a symbol into the current scope"""
+        # Keys are interned like the lexer's identifier tokens, so
+        # lookups compare names by identity
+        name = intern(name)
         if name in self.scopes[self.current_scope]:
             return False, f"{'Function' if is_function else 'Variable'} '{name}' already declared in this scope"
         
@@ -50,20 +69,23 @@ class SymbolTable:
         
         entry = SymbolEntry(name, var_type, self.current_scope, line, initialized, offset, is_function, param_types, return_type)
         self.scopes[self.current_scope][name] = entry
+        self.symbols.setdefault(name, []).append(entry)
         return True, entry
     
     def lookup(self, name):
         """Look up a symbol in all scopes (from current to global)"""
-        for i in range(self.current_scope, -1, -1):
-            if name in self.scopes[i]:
-                return self.scopes[i][name]
+        entries = self.symbols.get(name)
+        if entries:
+            return entries[-1]
         return None
     
     def lookup_current_scope(self, name):
         """Look up a symbol only in the current scope"""
-        if name in self.scopes[self.current_scope]:
-            return self.scopes[self.current_scope][name]
-        return None
+        return self.scopes[self.current_scope].get(name)
+    
+    def active_scopes(self):
+        """Scope dicts from global to current"""
+        return self.scopes[:self.current_scope + 1]
     
     def update_initialized(self, name):
         """Mark a variable as initialized"""
@@ -79,7 +101,7 @@ class SymbolTable:
     def print_table(self):
         """Print the symbol table for debugging"""
         print("\n=== SYMBOL TABLE ===")
-        for level, scope in enumerate(self.scopes):
+        for level, scope in enumerate(self.active_scopes()):
             print(f"\nScope Level {level}:")
             print(f"{'Name':<15} {'Type':<15} {'Line':<8} {'Init':<8} {'Offset':<8}")
             print("-" * 70)